@@ -1,23 +1,35 @@
+import time
+_import_start = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-import joblib
-from sklearn.preprocessing import OneHotEncoder
-import matplotlib.pyplot as plt
-import seaborn as sns
 import random
+import os
+
+# Modul berat (matplotlib/seaborn di dashboard, scipy di indeks skill) baru
+# di-import saat pertama kali dibutuhkan
+from artifacts import (
+    load_model, load_jobs, load_metrics, load_model_columns, load_feature_encoder,
+    load_recommendation_index, model_version, load_dashboard_summary, metrics_version
+)
+from features import FeatureEncoder, count_skills
+from prediction_cache import get_predictor
+import telemetry
 
-# Load model dan data
-model = joblib.load('best_salary_predictor.pkl')
-df = pd.read_csv('jobstreet_jobs_cleaned_with_category.csv')
+# Timing per rerun untuk panel debug (tidak melakukan apa-apa jika TELEMETRY mati)
+telemetry.start_run()
+if telemetry.enabled():
+    telemetry.record('startup:imports', time.perf_counter() - _import_start)
 
-# Buat kolom Gaji_Rata jika belum ada
-if 'Gaji_Rata' not in df.columns:
-    df['Gaji_Rata'] = (df['Gaji Min'] + df['Gaji Max']) / 2
+# Load data untuk form dan ringkasan (di-cache per proses, dimuat ulang jika file berubah).
+# Model dan indeks rekomendasi baru dimuat saat tombol prediksi ditekan.
+with telemetry.span('startup:load_artifacts'):
+    df = load_jobs()
+    summary = load_dashboard_summary()
 
 # Load metrik evaluasi (jika ada)
 try:
-    metrics = joblib.load('model_metrics.pkl')
+    metrics = load_metrics()
 except:
     metrics = {
         'best_model': 'XGBoost',
@@ -33,7 +45,7 @@ except:
 
 # PERBAIKAN 1: Muat daftar kolom yang digunakan saat training
 try:
-    model_columns = joblib.load('model_columns.pkl')
+    model_columns = load_model_columns()
 except:
     # Buat daftar kolom default jika file tidak ada
     model_columns = [
@@ -46,48 +58,11 @@ except:
         'Kategori_Lowongan_Apoteker'
     ]
 
-def preprocess_input(input_data, encoder):
-    pendidikan_map = {'SMA': 0, 'D3': 1, 'S1': 2, 'S2': 3, 'S3': 4}
-    
-    jumlah_skill = len(input_data['skills'].split(',')) if input_data['skills'] else 0
-    
-    input_df = pd.DataFrame({
-        'Jumlah_Skill': [jumlah_skill],
-        'Pendidikan_Encoded': [pendidikan_map.get(input_data['pendidikan'], -1)],
-        'Tahun Pengalaman': [input_data['pengalaman']],
-        'Kategori_Lowongan': [input_data['role']]
-    })
-    
-    kategori_encoded = encoder.transform(input_df[['Kategori_Lowongan']])
-    encoded_df = pd.DataFrame(
-        kategori_encoded, 
-        columns=encoder.get_feature_names_out(['Kategori_Lowongan'])
-    )
-    
-    input_processed = pd.concat([
-        input_df[['Jumlah_Skill', 'Pendidikan_Encoded', 'Tahun Pengalaman']],
-        encoded_df
-    ], axis=1)
-    
-    for col in model_columns:
-        if col not in input_processed.columns:
-            input_processed[col] = 0
-    
-    input_processed = input_processed[model_columns]
-    
-    return input_processed
-
-def rekomendasi_lowongan(predicted_salary, df, role, n=5):
-    role_based = df[df['Kategori_Lowongan'] == role].copy()
-    
-    if len(role_based) < n:
-        role_based = df.copy()
-    
-    role_based['Salary_Diff'] = abs(role_based['Gaji_Rata'] - predicted_salary)
-    
-    recommended = role_based.sort_values('Salary_Diff').head(n)
-    
-    return recommended[['Title', 'Posisi', 'Gaji', 'Link', 'Kualifikasi', 'Skill', 'Salary_Diff']]
+@telemetry.timed('rekomendasi_lowongan')
+def rekomendasi_lowongan(predicted_salary, index, role, n=5, skills=None):
+    # Indeks per kategori sudah terurut berdasarkan Gaji_Rata, dan jika skill
+    # diisi skor dicampur dengan kecocokan skill dari indeks TF-IDF sparse
+    return index.query(predicted_salary, role, n=n, skills=skills)
 
 st.set_page_config(page_title="Prediksi Gaji & Rekomendasi Lowongan", layout="wide")
 st.title('Cariin')
@@ -156,13 +131,24 @@ with col2:
             'skills': skills
         }
         
-        encoder = OneHotEncoder(sparse_output=False)
-        encoder.fit(df[['Kategori_Lowongan']])
+        try:
+            encoder = load_feature_encoder()
+        except:
+            encoder = FeatureEncoder(model_columns)
         
         try:
-            input_processed = preprocess_input(input_data, encoder)
-            
-            predicted_salary = model.predict(input_processed)[0]
+            with telemetry.span('load_predict_artifacts'):
+                model = load_model()
+                recommendation_index = load_recommendation_index()
+
+            # Prediksi di-cache per (role, pendidikan, pengalaman, jumlah skill)
+            # dan dipakai bersama semua sesi sampai versi model berubah
+            predictor = get_predictor(
+                model, encoder, model_version(),
+                precompute=os.environ.get('PREDICTION_GRID') == '1'
+            )
+            with telemetry.span('predict'):
+                predicted_salary = predictor.predict(input_data)
             
             st.success(f"### Estimasi Gaji Anda: **Rp{predicted_salary:,.2f}** per bulan")
             
@@ -174,13 +160,23 @@ with col2:
                 st.write(f"**Lokasi:** {lokasi}")
                 st.write(f"**Skill:** {skills}")
             
+            st.subheader("📈 Kurva Gaji: Pengalaman x Pendidikan")
+            # Seluruh grid pengalaman 0-30 x SMA-S3 dihitung dengan satu panggilan predict
+            with telemetry.span('salary_curve'):
+                curve = predictor.salary_curve(role, skills)
+            st.line_chart(curve, x_label="Tahun Pengalaman", y_label="Estimasi Gaji (Rp)")
+            st.caption(f"Estimasi gaji {role} dengan {count_skills(skills)} skill "
+                       f"untuk setiap tahun pengalaman dan jenjang pendidikan")
+            
             st.subheader("🎯 Rekomendasi Lowongan untuk Anda")
-            recommendations = rekomendasi_lowongan(predicted_salary, df, role)
+            recommendations = rekomendasi_lowongan(predicted_salary, recommendation_index, role, skills=skills)
             
             if recommendations.empty:
                 st.warning("Tidak ditemukan lowongan yang sesuai. Silakan coba dengan kriteria berbeda.")
             else:
                 for i, row in recommendations.iterrows():
+                    skill_score = row.get('Skill_Score')
+                    skill_match = "" if pd.isna(skill_score) else f"<p><b>Kecocokan skill:</b> {skill_score:.0%}</p>"
                     with st.container():
                         st.markdown(f"""
                         <div style="
@@ -193,6 +189,7 @@ with col2:
                             <p><a href="{row['Link']}" target="_blank" style="">Buka Lowongan di Jobstreet</a></p>
                             <p><b>Estimasi Gaji:</b> {row['Gaji']}</p>
                             <p><b>Selisih dengan prediksi Anda:</b> Rp{row.get('Salary_Diff', 0):,.2f}</p>
+                            {skill_match}
                             <details>
                                 <summary><b>Lihat Detail Kualifikasi</b></summary>
                                 <p><b>Kualifikasi:</b> {row.get('Kualifikasi', 'Tidak tersedia')}</p>
@@ -210,9 +207,10 @@ with col2:
         
         # Tampilkan beberapa lowongan acak sebagai contoh
         st.subheader("💼 Contoh Lowongan Tersedia")
-        sample_jobs = df.sample(min(3, len(df)))
+        # Diambil dari kumpulan sampel yang sudah dihitung di ringkasan dashboard
+        sample_jobs = random.sample(summary['sample_jobs'], min(3, len(summary['sample_jobs'])))
         
-        for _, row in sample_jobs.iterrows():
+        for row in sample_jobs:
             st.markdown(f"""
             <div style="
                 border: 1px solid #e0e0e0;
@@ -229,10 +227,7 @@ with col2:
             </div>
             """, unsafe_allow_html=True)
 
-st.header("ℹ️ Tentang Model dan Data")
-tab1, tab2, tab3 = st.tabs(["Akurasi Model", "Feature Importance", "Dataset"])
-
-with tab1:
+def render_akurasi():
     st.subheader("Evaluasi Performa Model")
     
     col1, col2, col3 = st.columns(3)
@@ -255,40 +250,15 @@ with tab1:
     - Skill yang dimiliki
     """)
 
-with tab2:
+def render_feature_importance():
+    from dashboard import feature_importance_png
+
     st.subheader("Faktor Paling Berpengaruh pada Prediksi Gaji")
     
-    if 'feature_importances' in metrics:
-        # Buat visualisasi feature importance
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Pastikan metrics['feature_importances'] adalah DataFrame
-        if isinstance(metrics['feature_importances'], pd.DataFrame):
-            df_importances = metrics['feature_importances']
-        else:
-            # Buat DataFrame jika format tidak sesuai
-            df_importances = pd.DataFrame({
-                'Feature': list(metrics['feature_importances'].keys()),
-                'Importance': list(metrics['feature_importances'].values())
-            })
-        
-        # Urutkan dan ambil top 10
-        df_importances = df_importances.sort_values('Importance', ascending=False).head(10)
-        
-        # PERBAIKAN 5: Gunakan parameter hue untuk menghindari warning
-        sns.barplot(
-            x='Importance', 
-            y='Feature', 
-            data=df_importances,
-            ax=ax,
-            hue='Feature',  # Tambahkan hue
-            legend=False,    # Sembunyikan legenda
-            palette="viridis"
-        )
-        ax.set_title('Top 10 Faktor Penentu Prediksi Gaji')
-        ax.set_xlabel('Tingkat Kepentingan')
-        ax.set_ylabel('Fitur')
-        st.pyplot(fig)
+    if metrics.get('feature_importances') is not None:
+        # Gambar di-cache sebagai PNG per versi metrik
+        with telemetry.span('figure:feature_importance'):
+            st.image(feature_importance_png(metrics['feature_importances'], metrics_version()))
         
         st.write("""
         **Interpretasi:**
@@ -300,45 +270,63 @@ with tab2:
     else:
         st.warning("Informasi feature importance tidak tersedia")
 
-with tab3:
+def render_dataset():
+    from dashboard import category_chart_png
+
     st.subheader("📁 Informasi Dataset")
     
-    st.write(f"Dataset ini berisi **{len(df)} lowongan kerja** dari berbagai sektor industri")
+    st.write(f"Dataset ini berisi **{summary['n_jobs']} lowongan kerja** dari berbagai sektor industri")
     
-    # Statistik dataset
+    # Statistik dataset (dihitung sekali per versi dataset)
     st.write("**Statistik Utama:**")
     
-    # Handle jika kolom tidak ada
-    gaji_min = df['Gaji Min'].min() if 'Gaji Min' in df else 0
-    gaji_max = df['Gaji Max'].max() if 'Gaji Max' in df else 0
-    gaji_rata = df['Gaji_Rata'].mean() if 'Gaji_Rata' in df else 0
-    
     st.json({
-        "Kategori Pekerjaan": df['Kategori_Lowongan'].nunique(),
-        "Rentang Gaji": f"Rp{gaji_min:,.0f} - Rp{gaji_max:,.0f}",
-        "Rata-rata Gaji": f"Rp{gaji_rata:,.0f}",
-        "Pendidikan Paling Umum": df['Pendidikan'].mode()[0] if 'Pendidikan' in df else "Tidak tersedia",
+        "Kategori Pekerjaan": summary['n_categories'],
+        "Rentang Gaji": f"Rp{summary['gaji_min']:,.0f} - Rp{summary['gaji_max']:,.0f}",
+        "Rata-rata Gaji": f"Rp{summary['gaji_rata']:,.0f}",
+        "Pendidikan Paling Umum": summary['pendidikan_mode'],
         "Sumber Data": "Jobstreet Indonesia (2023)"
     })
     
     # Tampilkan distribusi kategori pekerjaan
     st.subheader("Distribusi Kategori Pekerjaan")
-    category_counts = df['Kategori_Lowongan'].value_counts().head(10)
-    fig, ax = plt.subplots(figsize=(10, 6))
-    category_counts.plot(kind='bar', ax=ax, color='skyblue')
-    ax.set_title('Top 10 Kategori Pekerjaan')
-    ax.set_xlabel('Kategori')
-    ax.set_ylabel('Jumlah Lowongan')
-    plt.xticks(rotation=45, ha='right')
-    st.pyplot(fig)
+    with telemetry.span('figure:top_categories'):
+        st.image(category_chart_png(summary))
     
     # Tampilkan beberapa data
     st.subheader("Contoh Data Lowongan")
-    st.dataframe(df[['Title', 'Posisi', 'Gaji', 'Kategori_Lowongan']].head(10))
+    st.dataframe(pd.DataFrame(summary['head']))
+
+TABS = {
+    "Akurasi Model": render_akurasi,
+    "Feature Importance": render_feature_importance,
+    "Dataset": render_dataset,
+}
+
+st.header("ℹ️ Tentang Model dan Data")
+# Berbeda dengan st.tabs, hanya isi tab yang dipilih yang dijalankan dan dirender
+tab = st.radio("Tampilkan", list(TABS), horizontal=True, label_visibility="collapsed")
+with telemetry.span(f'render:tab:{tab}'):
+    TABS[tab]()
 
 # Catatan kaki
 st.markdown("---")
 st.caption("""
 Aplikasi prediksi gaji ini menggunakan model machine learning yang dilatih pada data lowongan kerja Jobstreet. 
 Prediksi bersifat estimasi dan dapat bervariasi berdasarkan faktor-faktor lain yang tidak termasuk dalam model.
-""")
\ No newline at end of file
+""")
+
+# Panel debug timing (hanya tampil jika TELEMETRY=1)
+if telemetry.enabled():
+    run_timings = telemetry.end_run()
+    with st.sidebar.expander("⏱️ Debug Timing"):
+        st.write("**Rerun ini:**")
+        st.dataframe(pd.DataFrame(
+            [(name, seconds * 1000) for name, seconds in run_timings],
+            columns=['Stage', 'ms']
+        ))
+        st.write("**Agregat proses (ms):**")
+        st.dataframe(pd.DataFrame({
+            name: {k: stats[k] * 1000 for k in ('p50', 'p95', 'p99')} | {'count': stats['count']}
+            for name, stats in telemetry.summary().items()
+        }).T)
@@ -0,0 +1,186 @@
+"""
+Cache artefak (model, dataset, metrik) yang dipakai bersama oleh semua sesi.
+
+Streamlit menjalankan ulang app.py pada setiap interaksi, tetapi modul yang
+di-import tetap hidup selama proses berjalan. Karena itu cache disimpan di
+level modul ini: setiap artefak dimuat sekali per proses dan hanya dimuat
+ulang jika file-nya berubah (mtime/ukuran berubah dan hash isinya berbeda).
+"""
+import hashlib
+import os
+import threading
+
+import joblib
+
+import telemetry
+from compiled_model import COMPILED_PATH, CompiledTreeEnsemble
+from dashboard import load_summary
+from dataset import APP_COLUMNS, dataset_path, load_dataset
+from features import ENCODER_PATH, FeatureEncoder
+from recommender import RecommendationIndex
+from skill_index import SKILL_INDEX_PATH, SkillIndex
+
+MODEL_PATH = 'best_salary_predictor.pkl'
+METRICS_PATH = 'model_metrics.pkl'
+COLUMNS_PATH = 'model_columns.pkl'
+
+_cache = {}
+_hashes = {}
+_lock = threading.RLock()
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """Hitung hash SHA-256 dari isi file."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cached_file_hash(path):
+    """Hash isi file, dihitung ulang hanya jika mtime/ukuran file berubah."""
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    entry = _hashes.get(path)
+    if entry is None or entry[0] != stamp:
+        entry = (stamp, file_hash(path))
+        _hashes[path] = entry
+    return entry[1]
+
+
+def load_artifact(path, loader):
+    """
+    Muat artefak melalui loader(path) dan simpan hasilnya di cache proses.
+
+    Pemanggilan berikutnya hanya melakukan os.stat. Jika mtime atau ukuran
+    file berubah, hash isi file dihitung ulang; artefak baru dimuat ulang
+    hanya jika hash-nya memang berbeda.
+    """
+    key = (os.path.abspath(path), loader.__module__, loader.__qualname__)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    entry = _cache.get(key)
+    if entry is not None and entry['stamp'] == stamp:
+        return entry['value']
+
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry['stamp'] == stamp:
+            return entry['value']
+        digest = file_hash(path)
+        if entry is not None and entry['hash'] == digest:
+            entry['stamp'] = stamp
+            return entry['value']
+        with telemetry.span(f'load:{os.path.basename(path)}'):
+            value = loader(path)
+        _cache[key] = {'stamp': stamp, 'hash': digest, 'value': value}
+        return value
+
+
+def artifact_version(path):
+    """Kembalikan versi (potongan hash) artefak yang sedang ter-cache, atau None."""
+    path = os.path.abspath(path)
+    # Salin di bawah lock: sesi Streamlit lain bisa menambah entri bersamaan
+    with _lock:
+        entries = list(_cache.items())
+    for key, entry in entries:
+        if key[0] == path:
+            return entry['hash'][:12]
+    return None
+
+
+def clear_cache():
+    """Kosongkan seluruh cache artefak."""
+    with _lock:
+        _cache.clear()
+
+
+def read_jobs(path):
+    """Baca kolom dataset lowongan yang dipakai app (Parquet bertipe atau CSV)."""
+    return load_dataset(APP_COLUMNS, path)
+
+
+def load_model(path=MODEL_PATH, compiled_path=COMPILED_PATH, prefer_compiled=True):
+    """
+    Muat model prediksi. Jika ada model terkompilasi (NumPy saja) yang dibuat
+    dari pickle yang sama, model itu yang dipakai sehingga scikit-learn dan
+    xgboost tidak perlu di-import.
+    """
+    if prefer_compiled and os.path.exists(compiled_path):
+        compiled = load_artifact(compiled_path, CompiledTreeEnsemble.load)
+        if not os.path.exists(path) or compiled.source_hash == cached_file_hash(path):
+            return compiled
+    return load_artifact(path, joblib.load)
+
+
+def load_jobs(path=None):
+    return load_artifact(path or dataset_path(), read_jobs)
+
+
+def read_recommendation_index(path):
+    """Bangun indeks rekomendasi dari dataset yang sudah ter-cache."""
+    return RecommendationIndex(load_jobs(path), skill_index=load_skill_index(path))
+
+
+def load_recommendation_index(path=None):
+    return load_artifact(path or dataset_path(), read_recommendation_index)
+
+
+def read_skill_index(path):
+    """Bangun indeks skill langsung dari dataset (jika skill_index.npz belum sesuai)."""
+    return SkillIndex.from_frame(load_jobs(path), source_hash=cached_file_hash(path))
+
+
+def load_skill_index(path=None, index_path=SKILL_INDEX_PATH):
+    """
+    Muat indeks skill sparse. skill_index.npz hanya dipakai jika dibuat dari
+    dataset yang sama; jika tidak, indeks dibangun ulang di memori.
+    """
+    path = path or dataset_path()
+    if os.path.exists(index_path):
+        index = load_artifact(index_path, SkillIndex.load)
+        if index.source_hash == cached_file_hash(path):
+            return index
+    return load_artifact(path, read_skill_index)
+
+
+def read_dashboard_summary(path):
+    """Ringkasan dashboard untuk dataset di path (di-cache juga di disk per versi)."""
+    return load_summary(load_jobs(path), cached_file_hash(path)[:12])
+
+
+def load_dashboard_summary(path=None):
+    return load_artifact(path or dataset_path(), read_dashboard_summary)
+
+
+def metrics_version(path=METRICS_PATH):
+    """Versi file metrik, atau 'default' jika file tidak ada."""
+    return cached_file_hash(path)[:12] if os.path.exists(path) else 'default'
+
+
+def model_version(path=MODEL_PATH):
+    """Versi model (potongan hash pickle), juga berlaku untuk model terkompilasinya."""
+    if os.path.exists(path):
+        return cached_file_hash(path)[:12]
+    return artifact_version(COMPILED_PATH)
+
+
+def load_metrics(path=METRICS_PATH):
+    return load_artifact(path, joblib.load)
+
+
+def load_model_columns(path=COLUMNS_PATH):
+    return load_artifact(path, joblib.load)
+
+
+def load_feature_encoder(path=ENCODER_PATH, columns_path=COLUMNS_PATH):
+    """Muat encoder fitur; jika artefaknya belum ada, bangun dari model_columns."""
+    if os.path.exists(path):
+        return load_artifact(path, FeatureEncoder.load)
+    return load_artifact(columns_path, _encoder_from_columns)
+
+
+def _encoder_from_columns(path):
+    return FeatureEncoder(joblib.load(path))
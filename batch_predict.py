@@ -0,0 +1,118 @@
+"""
+Prediksi gaji secara batch dari file CSV, JSONL, atau JSON (array profil), tanpa Streamlit.
+
+Setiap baris input adalah satu profil dengan kolom/key yang sama seperti
+form di app.py: role, pendidikan, pengalaman, skills. File dibaca per chunk,
+setiap chunk diubah menjadi satu matriks fitur dan diprediksi dengan satu
+panggilan model.predict, lalu hasilnya langsung ditulis ke file output.
+
+Contoh:
+    python batch_predict.py profil.jsonl -o prediksi.csv --chunk-size 50000
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+
+import pandas as pd
+
+from artifacts import load_feature_encoder, load_model
+from features import predict
+
+PROFILE_COLUMNS = ['role', 'pendidikan', 'pengalaman', 'skills']
+PREDICTION_COLUMN = 'Prediksi_Gaji'
+
+
+def _is_jsonl(path):
+    return os.path.splitext(path)[1].lower() in ('.jsonl', '.ndjson')
+
+
+def _is_json(path):
+    return os.path.splitext(path)[1].lower() == '.json'
+
+
+def iter_profile_chunks(path, chunk_size=10000):
+    """Baca profil dari CSV, JSONL, atau JSON (array objek profil) sebagai DataFrame per chunk."""
+    if _is_json(path):
+        with open(path, encoding='utf-8') as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError(f"{path} harus berisi array JSON objek profil")
+        for start in range(0, len(records), chunk_size):
+            yield pd.DataFrame.from_records(records[start:start + chunk_size])
+        return
+    if not _is_jsonl(path):
+        yield from pd.read_csv(path, chunksize=chunk_size)
+        return
+
+    with open(path, encoding='utf-8') as f:
+        lines = (line for line in f if line.strip())
+        while True:
+            batch = list(itertools.islice(lines, chunk_size))
+            if not batch:
+                break
+            yield pd.DataFrame.from_records([json.loads(line) for line in batch])
+
+
+def predict_frame(model, encoder, frame):
+    """Prediksi gaji untuk satu DataFrame profil dengan satu panggilan predict."""
+    missing = [c for c in PROFILE_COLUMNS if c not in frame.columns]
+    if missing:
+        raise ValueError(f"Kolom profil tidak ditemukan: {missing}")
+    X = encoder.transform_frame(frame)
+    return predict(model, X)
+
+
+def iter_predictions(path, model=None, encoder=None, chunk_size=10000):
+    """Hasilkan DataFrame per chunk yang sudah berisi kolom Prediksi_Gaji."""
+    model = model if model is not None else load_model(prefer_compiled=False)
+    encoder = encoder if encoder is not None else load_feature_encoder()
+    for frame in iter_profile_chunks(path, chunk_size):
+        frame[PREDICTION_COLUMN] = predict_frame(model, encoder, frame)
+        yield frame
+
+
+def write_chunk(frame, out_path, first):
+    """Tulis satu chunk hasil; chunk pertama menimpa file, sisanya append."""
+    mode = 'w' if first else 'a'
+    if _is_jsonl(out_path):
+        with open(out_path, mode, encoding='utf-8') as f:
+            frame.to_json(f, orient='records', lines=True, force_ascii=False)
+    else:
+        frame.to_csv(out_path, mode=mode, header=first, index=False)
+
+
+def run_batch(in_path, out_path, chunk_size=10000, runtime='pickle'):
+    """Jalankan prediksi batch dari in_path ke out_path, kembalikan jumlah baris."""
+    if _is_json(out_path):
+        # Hasil ditulis per chunk (append), jadi gunakan JSON Lines untuk output
+        raise ValueError(f"Output {out_path}: gunakan .jsonl/.ndjson atau .csv")
+    # Untuk chunk besar evaluator C di scikit-learn/xgboost lebih cepat;
+    # runtime 'compiled' tidak butuh kedua library tersebut
+    model = load_model(prefer_compiled=(runtime == 'compiled'))
+    total = 0
+    start = time.perf_counter()
+    for i, frame in enumerate(iter_predictions(in_path, model=model, chunk_size=chunk_size)):
+        write_chunk(frame, out_path, first=(i == 0))
+        total += len(frame)
+        print(f"[INFO] Chunk {i + 1}: {total} profil diprediksi")
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else 0
+    print(f"[INFO] Selesai: {total} profil dalam {elapsed:.2f} detik ({rate:,.0f} profil/detik) -> {out_path}")
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prediksi gaji batch dari CSV/JSONL")
+    parser.add_argument('input', help="File profil (.csv, .jsonl, atau .json berisi array)")
+    parser.add_argument('-o', '--output', required=True, help="File hasil (.csv atau .jsonl)")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Jumlah profil per chunk")
+    parser.add_argument('--runtime', choices=['pickle', 'compiled'], default='pickle',
+                        help="Model pickle asli atau model NumPy terkompilasi (salary_model.npz)")
+    args = parser.parse_args(argv)
+    run_batch(args.input, args.output, chunk_size=args.chunk_size, runtime=args.runtime)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Benchmark hot path: prediksi, rekomendasi, ekstraksi crawl, dan training.
+
+Data lowongan dibuat sintetis (bisa 10 ribu sampai 1 juta lowongan) dengan
+kategori, teks kualifikasi, dan gaji yang mirip data asli, sehingga hasil
+bisa dibandingkan antar commit tanpa bergantung pada hasil crawl. Hasil
+ditulis sebagai JSON.
+
+Benchmark startup menjalankan app.py di proses baru (Streamlit AppTest)
+dengan TELEMETRY=1 dan melaporkan first paint serta timing per fase.
+
+Benchmark crawl merekam lowongan sintetis sebagai halaman API lalu
+menjalankan fetch_jobstreet_jobs terhadap server replay lokal
+(http_cache.py), jadi seluruh pipeline fetch -> ekstrak -> tulis diukur
+tanpa jaringan.
+
+Contoh:
+    python benchmark.py --sizes 10000 100000 1000000 -o bench.json
+    python benchmark.py --only predict recommend
+    python benchmark.py --only startup
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from artifacts import load_feature_encoder, load_model
+from features import predict
+from dedupe import dedupe_frame
+from extraction import SKILLS, get_engine
+from fetcher import JobstreetFetcher
+from http_cache import ResponseCache, start_replay_server
+from prediction_cache import CachedPredictor
+from recommender import RecommendationIndex
+from skill_index import SkillIndex
+from testing import fetch_jobstreet_jobs, job_categories, parse_salary
+
+PENDIDIKAN = ['SMA', 'D3', 'S1', 'S2', 'S3']
+TEASER_TEMPLATES = [
+    "Dicari {cat} berpengalaman minimal {exp} tahun, pendidikan {deg}. Menguasai {skills}. Usia max {age} tahun.",
+    "We are hiring a {cat}. Requirements: {deg} degree, {exp} years of experience, skills in {skills}.",
+    "Join our team as {cat}! Competitive salary and benefits. Familiar with {skills}.",
+]
+
+
+def make_jobs(n, seed=0):
+    """Buat DataFrame n lowongan sintetis dengan kolom seperti dataset asli."""
+    rng = np.random.default_rng(seed)
+    categories = np.array([c.title() for c in dict.fromkeys(job_categories)] + ['Lainnya'])
+    cat = rng.choice(categories, size=n)
+    gaji_min = rng.integers(3, 30, size=n) * 500_000
+    gaji_max = gaji_min + rng.integers(0, 10, size=n) * 500_000
+    has_salary = rng.random(n) < 0.4
+    exp = rng.integers(0, 11, size=n)
+    deg = rng.choice(['S1', 'D3', 'SMA', 'S2', 'Bachelor', 'SMK'], size=n)
+    age = rng.integers(25, 45, size=n)
+    template = rng.integers(0, len(TEASER_TEMPLATES), size=n)
+    skill_sets = [", ".join(rng.choice(SKILLS, size=k, replace=False)) for k in rng.integers(1, 4, size=n)]
+
+    teasers = [
+        TEASER_TEMPLATES[t].format(cat=c.lower(), exp=e, deg=d, skills=s, age=a)
+        for t, c, e, d, s, a in zip(template, cat, exp, deg, skill_sets, age)
+    ]
+    gaji = [
+        f"Rp {lo:,} – Rp {hi:,} per month" if ok else "Tidak dicantumkan"
+        for lo, hi, ok in zip(gaji_min, gaji_max, has_salary)
+    ]
+    return pd.DataFrame({
+        'Kategori_Lowongan': pd.Categorical(cat),
+        'Title': [f"{c} Staff" for c in cat],
+        'Posisi': [f"{c} Staff" for c in cat],
+        'Gaji': gaji,
+        'Gaji Min': np.where(has_salary, gaji_min, np.nan),
+        'Gaji Max': np.where(has_salary, gaji_max, np.nan),
+        'Gaji_Rata': np.where(has_salary, (gaji_min + gaji_max) / 2, np.nan),
+        'Kualifikasi': teasers,
+        'Tahun Pengalaman': exp,
+        'Pendidikan': rng.choice(PENDIDIKAN, size=n),
+        'Skill': skill_sets,
+        'Link': [f"https://id.jobstreet.com/id/job/{i}" for i in range(n)],
+    })
+
+
+def make_profiles(n, roles, seed=0):
+    """Buat DataFrame n profil input seperti form di app.py."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'role': rng.choice(roles, size=n),
+        'pendidikan': rng.choice(PENDIDIKAN, size=n),
+        'pengalaman': rng.integers(0, 31, size=n),
+        'skills': rng.choice(['', 'Python', 'Python, SQL', 'Excel, SAP, Tax'], size=n),
+    })
+
+
+def _timeit(fn, repeat):
+    """Jalankan fn sebanyak repeat kali, kembalikan array durasi (detik)."""
+    times = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - start
+    return times
+
+
+def _latency(name, size, times, **extra):
+    ms = times * 1000
+    return {
+        'benchmark': name, 'size': size, 'unit': 'ms',
+        'p50': round(float(np.percentile(ms, 50)), 4),
+        'p95': round(float(np.percentile(ms, 95)), 4),
+        'p99': round(float(np.percentile(ms, 99)), 4),
+        'mean': round(float(ms.mean()), 4),
+        **extra,
+    }
+
+
+def _throughput(name, size, items, seconds, unit, **extra):
+    return {'benchmark': name, 'size': size, 'unit': unit,
+            'value': round(items / seconds, 1), 'seconds': round(seconds, 4), **extra}
+
+
+def bench_predict(size, repeat=200):
+    results = []
+    encoder = load_feature_encoder()
+    roles = list(encoder.category_index) or ['Lainnya']
+    profiles = make_profiles(size, roles)
+    one = profiles.iloc[0].to_dict()
+    for runtime, model in (('compiled', load_model()), ('pickle', load_model(prefer_compiled=False))):
+        times = _timeit(lambda: predict(model, encoder.transform(one)), repeat)
+        results.append(_latency('predict_single', 1, times, runtime=runtime))
+
+        start = time.perf_counter()
+        predict(model, encoder.transform_frame(profiles))
+        results.append(_throughput('predict_batch', size, size, time.perf_counter() - start,
+                                   'profiles/s', runtime=runtime))
+
+        # maxsize=0: cache langsung dibuang, jadi setiap kurva benar-benar dihitung
+        predictor = CachedPredictor(model, encoder, None, maxsize=0)
+        times = _timeit(lambda: predictor.salary_curve(one['role'], one['skills']), repeat)
+        results.append(_latency('salary_curve', 1, times, runtime=runtime))
+    return results
+
+
+def bench_recommend(jobs, repeat=500):
+    size = len(jobs)
+    start = time.perf_counter()
+    skill_index = SkillIndex.from_frame(jobs)
+    skill_build = time.perf_counter() - start
+    start = time.perf_counter()
+    index = RecommendationIndex(jobs, skill_index=skill_index)
+    build = time.perf_counter() - start
+
+    rng = np.random.default_rng(1)
+    roles = jobs['Kategori_Lowongan'].cat.categories
+    skill_sets = ['Python, SQL', 'Excel, SAP, Tax', 'Communication, Sales', 'Java, Docker']
+    queries = [(float(rng.uniform(3e6, 2e7)), roles[rng.integers(len(roles))], 5,
+                skill_sets[rng.integers(len(skill_sets))]) for _ in range(repeat)]
+    it = iter(queries)
+    times = _timeit(lambda: index.query(*next(it)[:2], n=5), repeat)
+    it = iter(queries)
+    skill_times = _timeit(lambda: index.query(*next(it)), repeat)
+    return [
+        {'benchmark': 'skill_index_build', 'size': size, 'unit': 's', 'value': round(skill_build, 4)},
+        {'benchmark': 'recommend_index_build', 'size': size, 'unit': 's', 'value': round(build, 4)},
+        _latency('recommend_top5', size, times),
+        _latency('recommend_top5_skills', size, skill_times),
+    ]
+
+
+def bench_extraction(jobs):
+    size = len(jobs)
+    engine = get_engine(tuple(job_categories))
+    items = list(zip(jobs['Title'], jobs['Kualifikasi']))
+    start = time.perf_counter()
+    for _ in engine.extract_many(items):
+        pass
+    results = [_throughput('extract', size, size, time.perf_counter() - start, 'teasers/s')]
+
+    start = time.perf_counter()
+    for s in jobs['Gaji']:
+        parse_salary(s)
+    results.append(_throughput('parse_salary', size, size, time.perf_counter() - start, 'strings/s'))
+
+    start = time.perf_counter()
+    keep, _ = dedupe_frame(jobs)
+    results.append(_throughput('dedupe', size, size, time.perf_counter() - start, 'postings/s',
+                               duplicates=int((~keep).sum())))
+    return results
+
+
+def bench_training(jobs, max_rows=100_000, n_jobs=1):
+    from train import build_encoder, fit_final, prepare_data, profile_frame
+
+    jobs = jobs.head(max_rows)
+    start = time.perf_counter()
+    df, y = prepare_data(jobs)
+    encoder = build_encoder(df)
+    X = encoder.transform_frame(profile_frame(df))
+    prep = time.perf_counter() - start
+
+    results = [{'benchmark': 'train_prepare', 'size': len(jobs), 'unit': 's', 'value': round(prep, 4)}]
+    params = {
+        'XGBoost': {'learning_rate': 0.1, 'max_depth': 5, 'subsample': 0.8, 'colsample_bytree': 0.8},
+        'RandomForest': {'n_estimators': 100, 'max_depth': 10},
+    }
+    for name, p in params.items():
+        start = time.perf_counter()
+        fit_final(name, p, X, y, n_jobs=n_jobs, seed=42)
+        results.append({'benchmark': 'train_fit', 'size': len(jobs), 'unit': 's', 'model': name,
+                        'value': round(time.perf_counter() - start, 4)})
+    return results
+
+
+def record_pages(jobs, directory, pagesize=32):
+    """Rekam lowongan sintetis sebagai respons API pencarian per halaman."""
+    recorder = ResponseCache.recorder(directory)
+    params = JobstreetFetcher(pagesize=pagesize).params
+    raw = [{'id': str(i), 'title': title, 'teaser': teaser, 'salaryLabel': gaji}
+           for i, (title, teaser, gaji) in enumerate(zip(jobs['Title'], jobs['Kualifikasi'], jobs['Gaji']))]
+    n_pages = -(-len(raw) // pagesize)
+    for page in range(1, n_pages + 2):
+        body = {'userQueryId': 'benchmark', 'totalCount': len(raw),
+                'data': raw[(page - 1) * pagesize:page * pagesize]}
+        recorder.put({**params, 'page': page}, json.dumps(body).encode('utf-8'))
+    return n_pages
+
+
+def bench_crawl(jobs, pagesize=32):
+    """Crawl penuh (fetch paralel, ekstraksi, tulis CSV) terhadap server replay lokal."""
+    with tempfile.TemporaryDirectory() as tmp:
+        n_pages = record_pages(jobs, os.path.join(tmp, 'recordings'), pagesize)
+        server, base_url = start_replay_server(os.path.join(tmp, 'recordings'), port=0)
+        try:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                fetch_jobstreet_jobs(max_pages=n_pages, pagesize=pagesize, out_csv=os.path.join(tmp, 'jobs.csv'),
+                                     base_url=base_url, rate=1e6, resume=False, raw_dir=None, dedupe=False,
+                                     cache_dir=None)
+            seconds = time.perf_counter() - start
+        finally:
+            server.shutdown()
+            server.server_close()
+    return [_throughput('crawl_replay', len(jobs), len(jobs), seconds, 'jobs/s', pages=n_pages)]
+
+
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.run()
+first_paint = time.perf_counter() - start
+at.button[0].click().run()
+print(first_paint, time.perf_counter() - start)
+"""
+
+
+def bench_startup(app_path='app.py'):
+    """Cold start app.py di proses baru: first paint, prediksi pertama, dan timing per fase."""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, 'timings.jsonl')
+        env = {**os.environ, 'TELEMETRY': '1', 'TELEMETRY_LOG': log_path}
+        env.pop('TELEMETRY_PORT', None)
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, '-W', 'ignore', '-c',
+                              STARTUP_SCRIPT.format(app=os.path.abspath(app_path))],
+                             capture_output=True, text=True, check=True, env=env)
+        wall = time.perf_counter() - start
+        first_paint, first_predict = map(float, out.stdout.split()[-2:])
+        with open(log_path, encoding='utf-8') as f:
+            runs = [json.loads(line) for line in f]
+
+    results = [
+        {'benchmark': 'startup_process', 'size': None, 'unit': 's', 'value': round(wall, 4)},
+        {'benchmark': 'startup_first_paint', 'size': None, 'unit': 's', 'value': round(first_paint, 4)},
+        {'benchmark': 'startup_first_predict', 'size': None, 'unit': 's', 'value': round(first_predict, 4)},
+    ]
+    for run_index, run in enumerate(runs):
+        for stage in run['stages']:
+            results.append({'benchmark': 'startup_phase', 'size': None, 'unit': 'ms', 'run': run_index,
+                            'stage': stage['stage'], 'value': stage['ms']})
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+BENCHMARKS = ['startup', 'predict', 'recommend', 'extract', 'crawl', 'train']
+
+
+def run(sizes, only=None, train_max_rows=100_000, n_jobs=1):
+    only = only or BENCHMARKS
+    results = []
+    if 'startup' in only:
+        print("[INFO] Benchmark startup app...")
+        results += bench_startup()
+    for size in sizes:
+        print(f"[INFO] Benchmark ukuran {size:,}...")
+        jobs = make_jobs(size)
+        if 'predict' in only:
+            results += bench_predict(size)
+        if 'recommend' in only:
+            results += bench_recommend(jobs)
+        if 'extract' in only:
+            results += bench_extraction(jobs)
+        if 'crawl' in only:
+            results += bench_crawl(jobs)
+        if 'train' in only:
+            results += bench_training(jobs, train_max_rows, n_jobs)
+    return {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark hot path prediksi gaji")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000],
+                        help="Jumlah lowongan sintetis (mis. 10000 100000 1000000)")
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help="Jalankan sebagian benchmark saja")
+    parser.add_argument('--train-max-rows', type=int, default=100_000,
+                        help="Batas baris untuk benchmark training")
+    parser.add_argument('--n-jobs', type=int, default=1, help="Paralelisme untuk benchmark training")
+    parser.add_argument('-o', '--output', help="Simpan hasil JSON ke file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.only, args.train_max_rows, args.n_jobs)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"[INFO] Hasil benchmark disimpan ke {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Ekspor model tree ensemble (XGBoost / RandomForest) ke array NumPy.
+
+Semua pohon dipadatkan ke array 2D berukuran (jumlah pohon, jumlah node
+maksimum): fitur split, threshold, anak kiri/kanan, arah nilai kosong, dan
+nilai leaf. Evaluator berjalan per level kedalaman untuk semua baris dan
+semua pohon sekaligus, sehingga serving hanya butuh NumPy (tanpa
+scikit-learn/xgboost) dan batch scoring tervektorisasi penuh.
+
+Leaf disimpan sebagai node yang menunjuk ke dirinya sendiri, jadi setelah
+max_depth langkah setiap baris pasti berhenti di leaf.
+
+Buat artefaknya dari best_salary_predictor.pkl:
+    python compiled_model.py
+"""
+import json
+import sys
+
+import numpy as np
+
+COMPILED_PATH = 'salary_model.npz'
+FORMAT_VERSION = 1
+
+
+class CompiledTreeEnsemble:
+    """Evaluator tree ensemble berbasis array NumPy."""
+
+    def __init__(self, feature, threshold, left, right, default_left, value,
+                 max_depth, base_score=0.0, average=False, strict=False,
+                 source_hash=None, source_kind=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.max_depth = int(max_depth)
+        self.base_score = float(base_score)
+        # RandomForest: rata-rata semua pohon; XGBoost: base_score + jumlah leaf
+        self.average = bool(average)
+        # XGBoost memakai x < threshold untuk ke kiri, sklearn x <= threshold
+        self.strict = bool(strict)
+        self.source_hash = source_hash
+        self.source_kind = source_kind
+
+    @property
+    def n_trees(self):
+        return self.feature.shape[0]
+
+    def _flatten(self):
+        """Siapkan array 1D dengan indeks node absolut untuk np.take yang cepat."""
+        n_trees, n_nodes = self.feature.shape
+        offsets = (np.arange(n_trees, dtype=np.int64) * n_nodes)[:, None]
+        dtype = np.float32 if self.strict else np.float64
+        self._flat = {
+            'offsets': offsets.ravel(),
+            'feature': self.feature.astype(np.int64).ravel(),
+            'threshold': self.threshold.astype(dtype).ravel(),
+            'left': (self.left + offsets).ravel(),
+            'right': (self.right + offsets).ravel(),
+            'default_left': self.default_left.ravel(),
+            'value': self.value.ravel(),
+        }
+        return self._flat
+
+    def _predict_block(self, X):
+        flat = getattr(self, '_flat', None) or self._flatten()
+        n, n_features = X.shape
+        if self.strict:
+            # XGBoost membandingkan fitur dan threshold dalam float32
+            X = X.astype(np.float32)
+        x_flat = X.ravel()
+        row_base = (np.arange(n, dtype=np.int64) * n_features)[:, None]
+        node = np.broadcast_to(flat['offsets'], (n, self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            x = x_flat.take(row_base + flat['feature'].take(node))
+            thr = flat['threshold'].take(node)
+            go_left = x < thr if self.strict else x <= thr
+            missing = np.isnan(x)
+            if missing.any():
+                go_left = np.where(missing, flat['default_left'].take(node), go_left)
+            node = np.where(go_left, flat['left'].take(node), flat['right'].take(node))
+        leaves = flat['value'].take(node)
+        if self.average:
+            return leaves.mean(axis=1)
+        return self.base_score + leaves.sum(axis=1)
+
+    def predict(self, X, block_size=4096):
+        """Prediksi untuk matriks fitur X berbentuk (n, n_features)."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        if len(X) <= block_size:
+            return self._predict_block(X)
+        return np.concatenate([
+            self._predict_block(X[i:i + block_size]) for i in range(0, len(X), block_size)
+        ])
+
+    def save(self, path=COMPILED_PATH):
+        meta = {
+            'version': FORMAT_VERSION,
+            'max_depth': self.max_depth,
+            'base_score': self.base_score,
+            'average': self.average,
+            'strict': self.strict,
+            'source_hash': self.source_hash,
+            'source_kind': self.source_kind,
+        }
+        np.savez_compressed(
+            path, feature=self.feature, threshold=self.threshold, left=self.left,
+            right=self.right, default_left=self.default_left, value=self.value,
+            meta=np.array(json.dumps(meta)),
+        )
+
+    @classmethod
+    def load(cls, path=COMPILED_PATH):
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != FORMAT_VERSION:
+                raise ValueError(f"Versi model terkompilasi {meta.get('version')} tidak didukung, buat ulang {path}")
+            arrays = {k: data[k] for k in ('feature', 'threshold', 'left', 'right', 'default_left', 'value')}
+        return cls(**arrays, max_depth=meta['max_depth'], base_score=meta['base_score'],
+                   average=meta['average'], strict=meta['strict'],
+                   source_hash=meta.get('source_hash'), source_kind=meta.get('source_kind'))
+
+
+def _pack(trees):
+    """Padatkan list pohon (dict berisi array per node) ke array 2D."""
+    n_trees = len(trees)
+    n_nodes = max(len(t['value']) for t in trees)
+    feature = np.zeros((n_trees, n_nodes), dtype=np.int32)
+    threshold = np.zeros((n_trees, n_nodes), dtype=np.float64)
+    default_left = np.zeros((n_trees, n_nodes), dtype=bool)
+    value = np.zeros((n_trees, n_nodes), dtype=np.float64)
+    # Node padding menunjuk ke dirinya sendiri dan tidak pernah dikunjungi
+    left = np.tile(np.arange(n_nodes, dtype=np.int32), (n_trees, 1))
+    right = left.copy()
+    for i, t in enumerate(trees):
+        k = len(t['value'])
+        feature[i, :k] = t['feature']
+        threshold[i, :k] = t['threshold']
+        left[i, :k] = t['left']
+        right[i, :k] = t['right']
+        default_left[i, :k] = t['default_left']
+        value[i, :k] = t['value']
+    return feature, threshold, left, right, default_left, value
+
+
+def _tree_depth(left, right):
+    depth = 0
+    frontier = [0]
+    while True:
+        nxt = [c for n in frontier for c in (left[n], right[n]) if c != n]
+        if not nxt:
+            return depth
+        depth += 1
+        frontier = nxt
+
+
+def _from_sklearn_forest(model):
+    trees = []
+    for est in model.estimators_:
+        t = est.tree_
+        idx = np.arange(t.node_count)
+        is_leaf = t.children_left < 0
+        missing_left = getattr(t, 'missing_go_to_left', np.zeros(t.node_count, dtype=np.uint8))
+        trees.append({
+            'feature': np.where(is_leaf, 0, t.feature),
+            'threshold': np.where(is_leaf, 0.0, t.threshold),
+            'left': np.where(is_leaf, idx, t.children_left),
+            'right': np.where(is_leaf, idx, t.children_right),
+            'default_left': missing_left.astype(bool),
+            'value': t.value[:, 0, 0],
+        })
+    return trees
+
+
+def _from_xgboost(model):
+    booster = model.get_booster()
+    config = json.loads(booster.save_config())
+    objective = config['learner']['objective']['name']
+    if objective != 'reg:squarederror':
+        raise ValueError(f"Objective XGBoost {objective} belum didukung")
+
+    names = booster.feature_names
+    feature_index = {name: i for i, name in enumerate(names)} if names else {}
+
+    def feat(split):
+        if split in feature_index:
+            return feature_index[split]
+        return int(split.lstrip('f'))
+
+    trees = []
+    for dump in booster.get_dump(dump_format='json'):
+        nodes = {}
+        stack = [json.loads(dump)]
+        while stack:
+            node = stack.pop()
+            nodes[node['nodeid']] = node
+            stack.extend(node.get('children', []))
+        k = max(nodes) + 1
+        tree = {
+            'feature': np.zeros(k, dtype=np.int32),
+            'threshold': np.zeros(k),
+            'left': np.arange(k, dtype=np.int32),
+            'right': np.arange(k, dtype=np.int32),
+            'default_left': np.zeros(k, dtype=bool),
+            'value': np.zeros(k),
+        }
+        for nid, node in nodes.items():
+            if 'leaf' in node:
+                tree['value'][nid] = node['leaf']
+                continue
+            tree['feature'][nid] = feat(node['split'])
+            tree['threshold'][nid] = node['split_condition']
+            tree['left'][nid] = node['yes']
+            tree['right'][nid] = node['no']
+            tree['default_left'][nid] = node['missing'] == node['yes']
+        trees.append(tree)
+    return trees
+
+
+def compile_model(model, source_hash=None):
+    """Ubah XGBRegressor atau RandomForestRegressor menjadi CompiledTreeEnsemble."""
+    kind = type(model).__name__
+    if kind == 'XGBRegressor':
+        trees = _from_xgboost(model)
+        best = getattr(model, 'best_iteration', None)
+        if best is not None:
+            trees = trees[:best + 1]
+        average, strict = False, True
+    elif hasattr(model, 'estimators_') and hasattr(model.estimators_[0], 'tree_'):
+        trees = _from_sklearn_forest(model)
+        average, strict = True, False
+    else:
+        raise ValueError(f"Model {kind} tidak didukung untuk dikompilasi")
+
+    packed = _pack(trees)
+    max_depth = max(_tree_depth(t['left'], t['right']) for t in trees)
+    compiled = CompiledTreeEnsemble(*packed, max_depth=max_depth, average=average, strict=strict,
+                                    source_hash=source_hash, source_kind=kind)
+    if kind == 'XGBRegressor':
+        # base_score diambil dari selisih prediksi margin asli dan jumlah leaf,
+        # agar tidak bergantung pada format konfigurasi versi xgboost tertentu
+        probe = np.zeros((1, model.n_features_in_))
+        compiled.base_score = float(model.predict(probe, output_margin=True)[0] - compiled.predict(probe)[0])
+    return compiled
+
+
+def export_model(model_path='best_salary_predictor.pkl', out_path=COMPILED_PATH, check_rows=None):
+    """
+    Kompilasi model pickle ke out_path. Jika check_rows diberikan, prediksi
+    dibandingkan dengan model asli dan selisih absolut maksimumnya dikembalikan.
+    """
+    import joblib
+    from artifacts import file_hash
+
+    model = joblib.load(model_path)
+    compiled = compile_model(model, source_hash=file_hash(model_path))
+    compiled.save(out_path)
+    if check_rows is None:
+        return compiled, None
+    expected = model.predict(check_rows)
+    actual = compiled.predict(check_rows)
+    return compiled, float(np.max(np.abs(expected - actual)))
+
+
+if __name__ == "__main__":
+    import warnings
+    from features import FeatureEncoder
+
+    warnings.filterwarnings('ignore')
+    src = sys.argv[1] if len(sys.argv) > 1 else 'best_salary_predictor.pkl'
+    encoder = FeatureEncoder.load()
+    rng = np.random.default_rng(0)
+    check = np.zeros((2000, encoder.n_features))
+    check[:, :3] = rng.integers(-1, 31, size=(2000, 3))
+    check[np.arange(2000), rng.integers(3, encoder.n_features, size=2000)] = 1
+    compiled, max_diff = export_model(src, COMPILED_PATH, check)
+    print(f"[INFO] {compiled.n_trees} pohon ({compiled.source_kind}, kedalaman {compiled.max_depth}) "
+          f"disimpan ke {COMPILED_PATH}; selisih maksimum vs model asli: {max_diff:.6f}")
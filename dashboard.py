@@ -0,0 +1,141 @@
+"""
+Agregat dan gambar untuk tab "Tentang Model dan Data" di app.py.
+
+Statistik dataset (jumlah lowongan, rentang gaji, distribusi kategori,
+contoh lowongan) dihitung sekali per versi dataset dan disimpan sebagai
+ringkasan JSON kecil. Grafik dirender sekali menjadi PNG yang di-cache per
+versi dataset/metrik, dan figure matplotlib langsung ditutup agar memori
+tidak bocor. Waktu render halaman tidak lagi bergantung pada ukuran data.
+"""
+import io
+import json
+import os
+
+import pandas as pd
+
+import telemetry
+
+CACHE_DIR = 'dashboard_cache'
+SAMPLE_POOL_SIZE = 50
+SUMMARY_VERSION = 1
+
+_png_cache = {}
+
+
+def _cache_path(name):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, name)
+
+
+def compute_summary(df, version):
+    """Hitung semua agregat yang ditampilkan dashboard dari DataFrame lowongan."""
+    def stat(col, fn):
+        return float(getattr(df[col], fn)()) if col in df and df[col].notna().any() else 0.0
+
+    sample_pool = df.sample(min(SAMPLE_POOL_SIZE, len(df)), random_state=0)
+    sample_columns = [c for c in ['Title', 'Posisi', 'Gaji', 'Link'] if c in df]
+    head_columns = [c for c in ['Title', 'Posisi', 'Gaji', 'Kategori_Lowongan'] if c in df]
+    counts = df['Kategori_Lowongan'].value_counts().head(10)
+    return {
+        'summary_version': SUMMARY_VERSION,
+        'dataset_version': version,
+        'n_jobs': int(len(df)),
+        'n_categories': int(df['Kategori_Lowongan'].nunique()),
+        'gaji_min': stat('Gaji Min', 'min'),
+        'gaji_max': stat('Gaji Max', 'max'),
+        'gaji_rata': stat('Gaji_Rata', 'mean'),
+        'pendidikan_mode': str(df['Pendidikan'].mode()[0]) if 'Pendidikan' in df else "Tidak tersedia",
+        'top_categories': {str(k): int(v) for k, v in counts.items()},
+        'sample_jobs': sample_pool[sample_columns].astype(str).to_dict('records'),
+        'head': df[head_columns].head(10).astype(str).to_dict('records'),
+    }
+
+
+def load_summary(df, version):
+    """Baca ringkasan dari cache disk; hitung ulang jika versi dataset berbeda."""
+    path = _cache_path('summary.json')
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            summary = json.load(f)
+        if summary.get('dataset_version') == version and summary.get('summary_version') == SUMMARY_VERSION:
+            return summary
+    summary = compute_summary(df, version)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    return summary
+
+
+def _cached_png(name, version, render):
+    """Kembalikan PNG dari cache disk, atau render lalu simpan jika belum ada."""
+    path = _cache_path(f'{name}-{version}.png')
+    if path in _png_cache:
+        return _png_cache[path]
+    if not os.path.exists(path):
+        with telemetry.span(f'render:{name}'):
+            import matplotlib.pyplot as plt
+
+            fig = render(plt)
+            buf = io.BytesIO()
+            try:
+                fig.savefig(buf, format='png', bbox_inches='tight')
+            finally:
+                plt.close(fig)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(buf.getvalue())
+        os.replace(tmp, path)
+    with open(path, 'rb') as f:
+        _png_cache[path] = f.read()
+    return _png_cache[path]
+
+
+def importance_frame(feature_importances):
+    """Top 10 feature importance sebagai DataFrame, dari DataFrame atau dict."""
+    if isinstance(feature_importances, pd.DataFrame):
+        df_importances = feature_importances
+    else:
+        df_importances = pd.DataFrame({
+            'Feature': list(feature_importances.keys()),
+            'Importance': list(feature_importances.values())
+        })
+    return df_importances.sort_values('Importance', ascending=False).head(10)
+
+
+def feature_importance_png(feature_importances, version):
+    """Barplot top 10 faktor penentu prediksi gaji, di-cache per versi metrik."""
+    def render(plt):
+        import seaborn as sns
+
+        fig, ax = plt.subplots(figsize=(10, 6))
+        sns.barplot(
+            x='Importance',
+            y='Feature',
+            data=importance_frame(feature_importances),
+            ax=ax,
+            hue='Feature',
+            legend=False,
+            palette="viridis"
+        )
+        ax.set_title('Top 10 Faktor Penentu Prediksi Gaji')
+        ax.set_xlabel('Tingkat Kepentingan')
+        ax.set_ylabel('Fitur')
+        return fig
+
+    return _cached_png('feature_importance', version, render)
+
+
+def category_chart_png(summary):
+    """Bar chart top 10 kategori pekerjaan, di-cache per versi dataset."""
+    def render(plt):
+        counts = pd.Series(summary['top_categories'])
+        fig, ax = plt.subplots(figsize=(10, 6))
+        counts.plot(kind='bar', ax=ax, color='skyblue')
+        ax.set_title('Top 10 Kategori Pekerjaan')
+        ax.set_xlabel('Kategori')
+        ax.set_ylabel('Jumlah Lowongan')
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+        return fig
+
+    return _cached_png('top_categories', summary['dataset_version'], render)
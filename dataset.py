@@ -0,0 +1,114 @@
+"""
+Format dataset kolumnar (Parquet) dengan tipe kolom yang benar.
+
+CSV hasil crawl menulis string "N/A" di kolom numerik, sehingga setiap load
+harus mem-parsing dan mengonversi ulang seluruh file teks. Modul ini
+mengubahnya sekali menjadi Parquet bertipe: Int64 nullable untuk gaji,
+pengalaman, dan umur, category untuk Kategori_Lowongan, serta Gaji_Rata
+yang sudah dihitung. Pembaca cukup memuat kolom yang dibutuhkan saja.
+
+pyarrow bersifat opsional: tanpa pyarrow, load_dataset kembali membaca CSV.
+
+Konversi manual:
+    python dataset.py jobstreet_jobs_cleaned_with_category.csv
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+CSV_PATH = 'jobstreet_jobs_cleaned_with_category.csv'
+
+INT_COLUMNS = ['Gaji Min', 'Gaji Max', 'Tahun Pengalaman', 'Umur']
+CATEGORY_COLUMNS = ['Kategori_Lowongan', 'Pekerjaan Lowongan']
+
+# Kolom yang dipakai app.py dan training
+APP_COLUMNS = [
+    'Kategori_Lowongan', 'Title', 'Posisi', 'Gaji', 'Gaji Min', 'Gaji Max',
+    'Kualifikasi', 'Pendidikan', 'Skill', 'Link', 'Gaji_Rata'
+]
+TRAIN_COLUMNS = [
+    'Kategori_Lowongan', 'Gaji Min', 'Gaji Max', 'Tahun Pengalaman', 'Pendidikan', 'Skill'
+]
+
+
+def parquet_path(csv_path=CSV_PATH):
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def to_typed(df):
+    """Ubah DataFrame hasil CSV menjadi kolom bertipe dan tambahkan Gaji_Rata."""
+    df = df.replace('N/A', np.nan)
+    for col in INT_COLUMNS:
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors='coerce')
+            df[col] = values.round().astype('Int64')
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    if 'Gaji Min' in df.columns and 'Gaji Max' in df.columns:
+        # Disimpan sebagai float64 biasa (NaN) agar langsung bisa dipakai NumPy
+        gaji_min = df['Gaji Min'].to_numpy(dtype=np.float64, na_value=np.nan)
+        gaji_max = df['Gaji Max'].to_numpy(dtype=np.float64, na_value=np.nan)
+        df['Gaji_Rata'] = (gaji_min + gaji_max) / 2
+    return df
+
+
+def write_parquet(df, path):
+    """Tulis DataFrame bertipe ke Parquet secara atomik."""
+    tmp = path + '.tmp'
+    df.to_parquet(tmp, engine='pyarrow', index=False)
+    os.replace(tmp, path)
+
+
+def convert_csv(csv_path=CSV_PATH, out_path=None):
+    """Konversi CSV bersih ke Parquet bertipe; kembalikan path hasil atau None."""
+    if not HAS_PYARROW:
+        print("[WARN] pyarrow tidak terpasang, konversi Parquet dilewati")
+        return None
+    out_path = out_path or parquet_path(csv_path)
+    write_parquet(to_typed(pd.read_csv(csv_path)), out_path)
+    return out_path
+
+
+def dataset_path(csv_path=CSV_PATH):
+    """
+    Pilih file dataset yang akan dibaca: Parquet jika ada, pyarrow tersedia,
+    dan tidak lebih lama dari CSV-nya; selain itu CSV.
+    """
+    pq = parquet_path(csv_path)
+    if HAS_PYARROW and os.path.exists(pq):
+        if not os.path.exists(csv_path) or os.path.getmtime(pq) >= os.path.getmtime(csv_path):
+            return pq
+    return csv_path
+
+
+def load_dataset(columns=None, path=None):
+    """Muat dataset bertipe, hanya kolom `columns` (None = semua kolom)."""
+    path = path or dataset_path()
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=columns, engine='pyarrow', memory_map=True)
+
+    usecols = None
+    if columns is not None:
+        # Gaji_Rata dihitung dari Gaji Min/Max, bukan dibaca dari CSV
+        usecols = set(columns) - {'Gaji_Rata'}
+        if 'Gaji_Rata' in columns:
+            usecols |= {'Gaji Min', 'Gaji Max'}
+        usecols = lambda c, wanted=usecols: c in wanted
+    df = to_typed(pd.read_csv(path, usecols=usecols))
+    return df[columns] if columns is not None else df
+
+
+if __name__ == "__main__":
+    src = sys.argv[1] if len(sys.argv) > 1 else CSV_PATH
+    out = convert_csv(src)
+    if out:
+        print(f"[INFO] Dataset bertipe disimpan ke {out}")
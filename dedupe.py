@@ -0,0 +1,351 @@
+"""
+Deteksi lowongan hampir duplikat (repost / iklan template) dengan MinHash + LSH.
+
+Teks judul + teaser dinormalisasi lalu dipecah menjadi shingle 5 karakter.
+Setiap lowongan diringkas menjadi signature MinHash NUM_PERM nilai; signature
+dibagi ke BANDS band, dan lowongan yang punya minimal satu band identik
+menjadi kandidat. Hanya kandidat yang dibandingkan (estimasi Jaccard dari
+signature), jadi tidak ada perbandingan semua pasangan.
+
+Indeks signature disimpan di <csv>.minhash.npz agar setiap crawl baru cukup
+dicek terhadap indeks yang sudah ada. Lowongan baru per halaman crawl hanya
+di-append ke <csv>.minhash.npz.log; log digabung ke file npz (compaction)
+setelah melebihi LOG_MIN_ENTRIES baris dan LOG_RATIO x ukuran indeks, jadi
+biaya simpan per halaman tidak tumbuh dengan ukuran indeks. Dataset yang sudah ada bisa
+dibersihkan dengan:
+    python dedupe.py jobstreet_jobs_cleaned_with_category.csv -o dedup.csv
+"""
+import argparse
+import json
+import os
+import re
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16
+THRESHOLD = 0.8
+SHINGLE_SIZE = 5
+FORMAT_VERSION = 1
+LOG_MIN_ENTRIES = 4096
+LOG_RATIO = 0.25
+
+_SHIFT = np.uint64(32)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text):
+    """Huruf kecil, hanya huruf/angka, spasi tunggal."""
+    return _NON_ALNUM.sub(" ", (text or "").lower()).strip()
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    """Shingle k karakter sebagai bilangan bulat unik (byte di-pack ke uint64)."""
+    data = np.frombuffer(normalize(text).encode("utf-8"), dtype=np.uint8)
+    if len(data) == 0:
+        return np.empty(0, dtype=np.uint64)
+    if len(data) < k:
+        data = np.concatenate([data, np.zeros(k - len(data), dtype=np.uint8)])
+    windows = np.lib.stride_tricks.sliding_window_view(data, k).astype(np.uint64)
+    packed = np.zeros(len(windows), dtype=np.uint64)
+    for j in range(k):
+        packed |= windows[:, j] << np.uint64(8 * j)
+    return np.unique(packed)
+
+
+def job_text(title, teaser):
+    return f"{title or ''} {teaser or ''}"
+
+
+class MinHashIndex:
+    """Indeks LSH atas signature MinHash, dengan kunci (mis. ID job) per lowongan."""
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, threshold=THRESHOLD, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm harus habis dibagi bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.seed = seed
+        # Hash universal multiply-shift: (a * x + b) >> 32 dengan overflow uint64
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+        self.keys = []
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._size = 0
+        # Bagian yang dimuat dari disk: band hash terurut per band (searchsorted)
+        self._sorted_hashes = []
+        self._sorted_rows = []
+        # Lowongan yang ditambahkan sejak dimuat: dict per band
+        self._recent = [{} for _ in range(bands)]
+        # Lowongan unik yang belum tersimpan (lihat stage/commit)
+        self._staged = []
+        # Baris [0, _persisted) sudah ada di disk (npz + log), _log_entries di log
+        self._persisted = 0
+        self._log_entries = 0
+
+    def __len__(self):
+        return self._size
+
+    def signature(self, text):
+        """Signature MinHash teks, atau None jika teks kosong."""
+        x = shingles(text)
+        if len(x) == 0:
+            return None
+        with np.errstate(over='ignore'):
+            hashed = (self._a[:, None] * x[None, :] + self._b[:, None]) >> _SHIFT
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def band_hashes(self, signatures):
+        """Hash uint64 per band untuk array signature berbentuk (n, num_perm)."""
+        sig = np.atleast_2d(signatures).astype(np.uint64).reshape(-1, self.bands, self.rows)
+        h = np.zeros(sig.shape[:2], dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for r in range(self.rows):
+                h = (h ^ sig[:, :, r]) * _MIX
+        return h
+
+    def _candidates(self, bands):
+        """Baris yang berbagi minimal satu band hash (bagian terurut + tambahan baru)."""
+        parts = []
+        recent = []
+        for b, h in enumerate(bands):
+            if self._sorted_hashes:
+                hashes = self._sorted_hashes[b]
+                lo = np.searchsorted(hashes, h, side='left')
+                hi = np.searchsorted(hashes, h, side='right')
+                if hi > lo:
+                    parts.append(self._sorted_rows[b][lo:hi])
+            rows = self._recent[b].get(int(h))
+            if rows:
+                recent.extend(rows)
+        if recent:
+            parts.append(np.asarray(recent, dtype=np.intp))
+        if not parts:
+            return None
+        return np.unique(np.concatenate(parts))
+
+    def query(self, signature, exclude=None):
+        """
+        Kunci lowongan yang hampir sama (estimasi Jaccard >= threshold), atau
+        None. Lowongan dengan kunci exclude (job itu sendiri) tidak dihitung.
+        """
+        minimum = self.threshold * self.num_perm
+        for key, staged in self._staged:
+            if key != exclude and np.count_nonzero(staged == signature) >= minimum:
+                return key
+        rows = self._candidates(self.band_hashes(signature)[0])
+        if rows is None:
+            return None
+        similarity = np.count_nonzero(self._signatures[rows] == signature, axis=1)
+        if exclude is not None:
+            similarity[[self.keys[r] == exclude for r in rows]] = -1
+        best = int(np.argmax(similarity))
+        if similarity[best] >= minimum:
+            return self.keys[rows[best]]
+        return None
+
+    def add(self, key, signature):
+        if self._size == len(self._signatures):
+            grown = np.empty((max(1024, 2 * self._size), self.num_perm), dtype=np.uint32)
+            grown[:self._size] = self._signatures[:self._size]
+            self._signatures = grown
+        row = self._size
+        self._signatures[row] = signature
+        self.keys.append(key)
+        self._size += 1
+        for b, h in enumerate(self.band_hashes(signature)[0]):
+            self._recent[b].setdefault(int(h), []).append(row)
+
+    def check_and_add(self, key, text, stage=False):
+        """
+        Kembalikan kunci lowongan lama yang hampir sama dengan text, atau None
+        jika unik. Lowongan unik langsung ditambahkan ke indeks, atau jika
+        stage=True ditahan sampai commit() (mis. setelah barisnya ditulis).
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        duplicate = self.query(signature, exclude=key)
+        if duplicate is None:
+            if stage:
+                self._staged.append((key, signature))
+            else:
+                self.add(key, signature)
+        return duplicate
+
+    def commit(self):
+        """Tambahkan lowongan yang di-stage ke indeks."""
+        staged, self._staged = self._staged, []
+        for key, signature in staged:
+            self.add(key, signature)
+
+    def _build_sorted(self):
+        hashes = self.band_hashes(self._signatures[:self._size])
+        order = np.argsort(hashes, axis=0, kind='stable')
+        self._sorted_rows = [order[:, b] for b in range(self.bands)]
+        self._sorted_hashes = [hashes[order[:, b], b] for b in range(self.bands)]
+        self._recent = [{} for _ in range(self.bands)]
+
+    def save(self, path):
+        """Tulis seluruh indeks ke path (atomik) dan hapus log append-nya."""
+        meta = {'version': FORMAT_VERSION, 'num_perm': self.num_perm, 'bands': self.bands,
+                'threshold': self.threshold, 'seed': self.seed}
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, keys=np.array(self.keys, dtype=str),
+                            signatures=self._signatures[:self._size], meta=np.array(json.dumps(meta)))
+        os.replace(tmp, path)
+        # Isi log sudah masuk npz; jika terputus sebelum ini, load melewati kunci yang sudah ada
+        try:
+            os.remove(log_path(path))
+        except FileNotFoundError:
+            pass
+        self._persisted = self._size
+        self._log_entries = 0
+
+    def flush(self, path):
+        """
+        Simpan baris yang belum tersimpan secara inkremental: di-append ke log
+        (fsync), atau save() penuh jika npz belum ada atau log sudah besar.
+        """
+        pending = self._size - self._persisted
+        if not pending:
+            return
+        limit = max(LOG_MIN_ENTRIES, LOG_RATIO * self._size)
+        if not os.path.exists(path) or self._log_entries + pending > limit:
+            self.save(path)
+            return
+        lines = [json.dumps([self.keys[row], self._signatures[row].tobytes().hex()]) + "\n"
+                 for row in range(self._persisted, self._size)]
+        with open(log_path(path), "ab") as f:
+            f.write("".join(lines).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        self._persisted = self._size
+        self._log_entries += pending
+
+    def _replay_log(self, path):
+        """Tambahkan entri log ke indeks; baris terakhir yang terpotong dibuang dari file."""
+        with open(path, "rb") as f:
+            data = f.read()
+        known = set(self.keys)
+        valid = 0
+        entries = 0
+        for line in data.splitlines(keepends=True):
+            try:
+                key, signature = json.loads(line)
+                signature = np.frombuffer(bytes.fromhex(signature), dtype=np.uint32)
+            except (TypeError, ValueError):
+                break
+            if not line.endswith(b"\n") or len(signature) != self.num_perm:
+                break
+            valid += len(line)
+            entries += 1
+            if key not in known:
+                known.add(key)
+                self.add(key, signature)
+        if valid < len(data):
+            with open(path, "r+b") as f:
+                f.truncate(valid)
+        return entries
+
+    @classmethod
+    def load(cls, path):
+        """Muat indeks dari npz beserta log append-nya (jika ada)."""
+        if os.path.exists(path):
+            with np.load(path) as data:
+                meta = json.loads(str(data['meta']))
+                if meta.get('version') != FORMAT_VERSION:
+                    raise ValueError(f"Versi indeks MinHash {meta.get('version')} tidak didukung, buat ulang {path}")
+                index = cls(meta['num_perm'], meta['bands'], meta['threshold'], meta['seed'])
+                index.keys = data['keys'].tolist()
+                index._signatures = data['signatures'].copy()
+            index._size = len(index.keys)
+            index._build_sorted()
+        else:
+            index = cls()
+        if os.path.exists(log_path(path)):
+            index._log_entries = index._replay_log(log_path(path))
+        index._persisted = index._size
+        return index
+
+
+def index_path(out_csv):
+    return out_csv + ".minhash.npz"
+
+
+def log_path(path):
+    return path + ".log"
+
+
+def link_key(link):
+    """ID job dari kolom Link (sama dengan ID di checkpoint crawl)."""
+    return str(link).rsplit("/", 1)[-1]
+
+
+def dedupe_frame(df, index=None):
+    """
+    Tandai baris unik DataFrame lowongan (kolom Title, Kualifikasi, Link).
+    Kembalikan (mask baris yang dipertahankan, indeks). Baris pertama dari
+    setiap kelompok hampir-duplikat yang dipertahankan.
+    """
+    if index is None:
+        index = MinHashIndex()
+    keep = np.ones(len(df), dtype=bool)
+    for i, (title, teaser, link) in enumerate(zip(df['Title'], df['Kualifikasi'], df['Link'])):
+        teaser = "" if teaser == "N/A" or not isinstance(teaser, str) else teaser
+        if index.check_and_add(link_key(link), job_text(title, teaser)) is not None:
+            keep[i] = False
+    return keep, index
+
+
+def load_or_build_index(out_csv):
+    """
+    Muat indeks MinHash milik out_csv. Jika belum ada tetapi CSV sudah ada,
+    indeks dibangun dari isi CSV agar crawl berikutnya dicek terhadapnya.
+    """
+    path = index_path(out_csv)
+    if os.path.exists(path) or os.path.exists(log_path(path)):
+        return MinHashIndex.load(path)
+    if os.path.exists(out_csv) and os.path.getsize(out_csv) > 0:
+        import pandas as pd
+
+        df = pd.read_csv(out_csv, usecols=['Title', 'Kualifikasi', 'Link'], dtype=str, keep_default_na=False)
+        return dedupe_frame(df)[1]
+    return MinHashIndex()
+
+
+def main(argv=None):
+    import time
+
+    import pandas as pd
+
+    from dataset import convert_csv, parquet_path
+
+    parser = argparse.ArgumentParser(description="Hapus lowongan hampir duplikat dari dataset CSV")
+    parser.add_argument("dataset", help="CSV dataset lowongan")
+    parser.add_argument("-o", "--output", default=None, help="CSV hasil (default: timpa dataset)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Batas estimasi Jaccard")
+    args = parser.parse_args(argv)
+
+    out_csv = args.output or args.dataset
+    start = time.perf_counter()
+    df = pd.read_csv(args.dataset, dtype=str, keep_default_na=False)
+    keep, index = dedupe_frame(df, MinHashIndex(threshold=args.threshold))
+    tmp = out_csv + ".tmp"
+    df[keep].to_csv(tmp, index=False)
+    os.replace(tmp, out_csv)
+    index.save(index_path(out_csv))
+    elapsed = time.perf_counter() - start
+    print(f"[INFO] {int((~keep).sum())} dari {len(df)} lowongan hampir duplikat dibuang "
+          f"({elapsed:.1f} detik) -> {out_csv}")
+    if convert_csv(out_csv):
+        print(f"[INFO] Dataset bertipe disimpan ke {parquet_path(out_csv)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Mesin ekstraksi kualifikasi yang semua pola regex-nya dikompilasi sekali.
+
+Skill dan kategori dicocokkan dalam satu kali scan teks (lowercase) memakai
+satu regex gabungan yang disusun sebagai trie: pada setiap posisi regex
+hanya menelusuri cabang huruf yang cocok, sehingga biaya scan linear
+terhadap panjang teks, bukan panjang teks x jumlah kata kunci. Hasilnya
+sama dengan pencocokan substring per kata kunci di testing.py.
+"""
+import functools
+import re
+
+SKILLS = ["excel", "python", "sap", "finance", "accounting", "sql", "communication",
+          "microsoft office", "erp", "tax", "java", "jira"]
+DEGREES = ["S1", "S2", "D3", "Diploma", "Bachelor", "Master", "Sarjana", "SMK", "SMA"]
+
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(?:pengalaman|experience|berpengalaman|years of experience|work experience)[^\d]{0,20}(\d+)\s*(?:tahun|years?)', re.IGNORECASE),
+    re.compile(r'min(?:imum)?\.?\s*(\d+)\s*(?:tahun|years?)\s*(?:pengalaman|experience)?', re.IGNORECASE),
+]
+AGE_PATTERNS = [
+    re.compile(r'(?:usia|max(?:imal)?|umur|berusia|age)[^\d]{0,20}(\d+)\s*(?:tahun|years?)', re.IGNORECASE),
+]
+DEGREE_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(re.escape(d) for d in DEGREES) + r')\b', re.IGNORECASE
+)
+DEGREE_RANK = {d.lower(): i for i, d in enumerate(DEGREES)}
+
+
+def _trie_regex(trie):
+    """Susun regex dari trie {karakter: sub-trie}; key '' menandai akhir kata kunci."""
+    branches = []
+    for ch in sorted(k for k in trie if k):
+        branches.append(re.escape(ch) + _trie_regex(trie[ch]))
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in trie:
+        # Kuantifier greedy mencoba kata kunci terpanjang terlebih dahulu
+        return '(?:' + body + ')?'
+    return body
+
+
+class KeywordMatcher:
+    """
+    Cari semua kata kunci (substring, case-insensitive) dalam satu kali scan.
+
+    Pada tiap posisi regex mengembalikan kata kunci terpanjang yang dimulai di
+    sana. Kata kunci lain yang juga dimulai di posisi itu pasti prefiks dari
+    kata kunci terpanjang tersebut, sehingga ikut ditambahkan lewat tabel
+    prefiks yang dihitung saat inisialisasi.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(k.lower() for k in keywords))
+        trie = {}
+        for keyword in self.keywords:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[''] = {}
+        self.pattern = re.compile('(?=(' + _trie_regex(trie) + '))')
+        self.prefixes = {
+            keyword: [k for k in self.keywords if keyword.startswith(k)]
+            for keyword in self.keywords
+        }
+
+    def finditer(self, text):
+        """Hasilkan (posisi, kata kunci) untuk semua kemunculan di text (lowercase)."""
+        for m in self.pattern.finditer(text):
+            for keyword in self.prefixes[m.group(1)]:
+                yield m.start(), keyword
+
+    def find(self, text):
+        """Kembalikan himpunan kata kunci yang muncul di text (lowercase)."""
+        return {keyword for _, keyword in self.finditer(text)}
+
+
+class ExtractionEngine:
+    """Ekstraksi pengalaman, usia, pendidikan, skill, dan kategori per lowongan."""
+
+    def __init__(self, categories, skills=SKILLS):
+        self.categories = list(categories)
+        self.skills = list(skills)
+        self.category_rank = {}
+        for i, cat in enumerate(self.categories):
+            self.category_rank.setdefault(cat.lower(), i)
+        self.skill_rank = {}
+        for i, skill in enumerate(self.skills):
+            self.skill_rank.setdefault(skill.lower(), i)
+        self.matcher = KeywordMatcher(list(self.category_rank) + list(self.skill_rank))
+
+    @staticmethod
+    def _first_number(patterns, text):
+        if not text:
+            return None
+        for pat in patterns:
+            m = pat.search(text)
+            if m:
+                return int(m.group(1))
+        return None
+
+    def experience(self, text):
+        return self._first_number(EXPERIENCE_PATTERNS, text)
+
+    def age(self, text):
+        return self._first_number(AGE_PATTERNS, text)
+
+    def education(self, text):
+        if not text:
+            return None
+        found = {m.group(0).lower() for m in DEGREE_PATTERN.finditer(text)}
+        if found:
+            return ",".join(DEGREES[i] for i in sorted(DEGREE_RANK[d] for d in found))
+        return None
+
+    def _keywords(self, text, offset):
+        """Scan text sekali; kembalikan (kategori, skill) dengan skill hanya dari text[offset:]."""
+        categories, skills = set(), set()
+        for pos, keyword in self.matcher.finditer(text):
+            if keyword in self.category_rank:
+                categories.add(keyword)
+            if pos >= offset and keyword in self.skill_rank:
+                skills.add(keyword)
+        return categories, skills
+
+    def _category(self, found):
+        if not found:
+            return "Lainnya"
+        return self.categories[min(self.category_rank[c] for c in found)].title()
+
+    def _skills(self, found):
+        if not found:
+            return None
+        return ",".join(self.skills[i] for i in sorted(self.skill_rank[s] for s in found))
+
+    def category(self, text):
+        categories, _ = self._keywords(str(text).lower(), offset=0)
+        return self._category(categories)
+
+    def skill(self, text):
+        if not text:
+            return None
+        _, skills = self._keywords(text.lower(), offset=0)
+        return self._skills(skills)
+
+    def extract(self, title, teaser):
+        """
+        Ekstrak satu lowongan. Kategori dicari pada "title teaser", sedangkan
+        skill, pendidikan, pengalaman, dan usia hanya dari teaser.
+        """
+        title = (title or "").lower()
+        teaser = teaser or ""
+        categories, skills = self._keywords(f"{title} {teaser.lower()}", offset=len(title) + 1)
+        return {
+            "Kategori Lowongan": self._category(categories),
+            "Tahun Pengalaman": self.experience(teaser),
+            "Umur": self.age(teaser),
+            "Pendidikan": self.education(teaser),
+            "Skill": self._skills(skills) if teaser else None,
+        }
+
+    def extract_many(self, items):
+        """Ekstrak banyak lowongan; items berupa iterable (title, teaser)."""
+        for title, teaser in items:
+            yield self.extract(title, teaser)
+
+
+@functools.lru_cache(maxsize=8)
+def get_engine(categories):
+    """Engine yang di-cache per daftar kategori (tuple)."""
+    return ExtractionEngine(categories)
@@ -0,0 +1,144 @@
+"""
+Encoder fitur yang dipersist saat training dan dipakai ulang saat serving.
+
+Encoder ini memetakan profil mentah (role, pendidikan, pengalaman, skills)
+langsung ke baris NumPy dengan urutan `model_columns`, memakai indeks kolom
+yang sudah dihitung sebelumnya. Tidak ada OneHotEncoder yang di-fit ulang
+per klik, sehingga tidak ada risiko perbedaan encoding antara training dan
+serving.
+
+Buat artefaknya dari model_columns.pkl:
+    python features.py
+"""
+import hashlib
+import warnings
+
+import joblib
+import numpy as np
+
+ENCODER_PATH = 'feature_encoder.pkl'
+ENCODER_VERSION = 1
+
+PENDIDIKAN_MAP = {'SMA': 0, 'D3': 1, 'S1': 2, 'S2': 3, 'S3': 4}
+CATEGORY_PREFIX = 'Kategori_Lowongan_'
+
+
+def predict(model, X):
+    """
+    model.predict(X) untuk matriks dari FeatureEncoder. Urutan kolom sudah
+    dijamin encoder, jadi peringatan sklearn soal nama fitur (model di-fit
+    dengan DataFrame) hanya diredam untuk panggilan ini, tidak untuk seluruh
+    proses.
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message='X does not have valid feature names')
+        return model.predict(X)
+
+
+def count_skills(skills):
+    """Hitung jumlah skill dari string yang dipisahkan koma."""
+    return len(skills.split(',')) if skills else 0
+
+
+class FeatureEncoder:
+    """Transformasi profil -> vektor fitur sesuai urutan kolom model."""
+
+    def __init__(self, columns, pendidikan_map=None):
+        self.columns = list(columns)
+        self.pendidikan_map = dict(pendidikan_map or PENDIDIKAN_MAP)
+        self.index = {col: i for i, col in enumerate(self.columns)}
+        self.category_index = {
+            col[len(CATEGORY_PREFIX):]: i
+            for i, col in enumerate(self.columns)
+            if col.startswith(CATEGORY_PREFIX)
+        }
+        self.version = hashlib.sha256(
+            '\n'.join(self.columns).encode('utf-8')
+        ).hexdigest()[:12]
+
+    @property
+    def n_features(self):
+        return len(self.columns)
+
+    def _fill(self, row, role, pendidikan, pengalaman, jumlah_skill):
+        idx = self.index.get('Jumlah_Skill')
+        if idx is not None:
+            row[idx] = jumlah_skill
+        idx = self.index.get('Pendidikan_Encoded')
+        if idx is not None:
+            row[idx] = self.pendidikan_map.get(pendidikan, -1)
+        idx = self.index.get('Tahun Pengalaman')
+        if idx is not None:
+            row[idx] = pengalaman
+        # Role yang tidak dikenal model menghasilkan semua kolom kategori 0
+        idx = self.category_index.get(role)
+        if idx is not None:
+            row[idx] = 1.0
+
+    def transform(self, profile):
+        """Ubah satu profil (dict) menjadi array berbentuk (1, n_features)."""
+        X = np.zeros((1, self.n_features), dtype=np.float64)
+        self._fill(
+            X[0], profile['role'], profile['pendidikan'], profile['pengalaman'],
+            count_skills(profile['skills'])
+        )
+        return X
+
+    def transform_many(self, profiles):
+        """Ubah banyak profil menjadi satu matriks fitur."""
+        profiles = list(profiles)
+        X = np.zeros((len(profiles), self.n_features), dtype=np.float64)
+        for row, profile in zip(X, profiles):
+            self._fill(
+                row, profile['role'], profile['pendidikan'], profile['pengalaman'],
+                count_skills(profile['skills'])
+            )
+        return X
+
+    def transform_frame(self, frame):
+        """
+        Ubah DataFrame profil (kolom role, pendidikan, pengalaman, skills)
+        menjadi matriks fitur secara tervektorisasi, tanpa loop per baris.
+        """
+        n = len(frame)
+        X = np.zeros((n, self.n_features), dtype=np.float64)
+
+        idx = self.index.get('Jumlah_Skill')
+        if idx is not None:
+            skills = frame['skills'].fillna('').astype(str)
+            X[:, idx] = np.where(skills == '', 0, skills.str.count(',') + 1)
+        idx = self.index.get('Pendidikan_Encoded')
+        if idx is not None:
+            X[:, idx] = frame['pendidikan'].map(self.pendidikan_map).fillna(-1).to_numpy()
+        idx = self.index.get('Tahun Pengalaman')
+        if idx is not None:
+            X[:, idx] = frame['pengalaman'].to_numpy(dtype=np.float64)
+
+        cat_idx = frame['role'].map(self.category_index).to_numpy(dtype=np.float64)
+        known = ~np.isnan(cat_idx)
+        X[np.flatnonzero(known), cat_idx[known].astype(np.intp)] = 1.0
+        return X
+
+    def save(self, path=ENCODER_PATH):
+        joblib.dump({
+            'version': ENCODER_VERSION,
+            'columns': self.columns,
+            'pendidikan_map': self.pendidikan_map,
+        }, path)
+
+    @classmethod
+    def load(cls, path=ENCODER_PATH):
+        state = joblib.load(path)
+        if state.get('version') != ENCODER_VERSION:
+            raise ValueError(
+                f"Versi encoder {state.get('version')} tidak didukung "
+                f"(diharapkan {ENCODER_VERSION}), buat ulang {path}"
+            )
+        return cls(state['columns'], state['pendidikan_map'])
+
+
+if __name__ == "__main__":
+    columns = joblib.load('model_columns.pkl')
+    encoder = FeatureEncoder(columns)
+    encoder.save(ENCODER_PATH)
+    print(f"[INFO] Encoder {encoder.version} dengan {encoder.n_features} kolom disimpan ke {ENCODER_PATH}")
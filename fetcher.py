@@ -0,0 +1,159 @@
+"""
+Fetcher paralel untuk API pencarian Jobstreet.
+
+Halaman diambil bersamaan oleh thread pool lewat satu requests.Session yang
+connection pool-nya dipakai ulang. Laju request dibatasi token bucket
+(politeness budget), dan error sementara (koneksi, timeout, 429, 5xx)
+dicoba ulang dengan exponential backoff. Jumlah halaman dibatasi oleh
+totalCount dari respons pertama sehingga crawl berhenti lebih awal.
+
+Jika cache (http_cache.ResponseCache) diberikan, halaman yang masih ada di
+cache disk dilayani tanpa request (dan tanpa memakai token rate limit), dan
+setiap respons baru disimpan ke cache. Request pencarian awal selalu diambil
+langsung agar totalCount dan userQueryId tidak basi. base_url bisa diarahkan ke server
+replay (http_cache.py replay) atau stub lokal untuk pengujian offline;
+`python fetcher_check.py` memeriksa rate limit, backoff, dan retry terhadap
+server stub tanpa jaringan.
+"""
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = "https://id.jobstreet.com/api/jobsearch/v5/search"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Referer": "https://id.jobstreet.com/id/jobs",
+}
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Rate limiter thread-safe: rate token per detik, maksimal burst token."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Tunggu sampai satu token tersedia, lalu ambil token tersebut."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchError(Exception):
+    """Request tetap gagal setelah semua percobaan ulang."""
+
+
+def make_session(pool_size=8, headers=None):
+    """Buat requests.Session dengan connection pool sebesar pool_size."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(headers or HEADERS)
+    return session
+
+
+class JobstreetFetcher:
+    """Ambil halaman hasil pencarian secara paralel dengan rate limit dan retry."""
+
+    def __init__(self, base_url=BASE_URL, pagesize=32, concurrency=8, rate=8.0, burst=None,
+                 retries=4, backoff=0.5, timeout=30, session=None, cache=None):
+        self.base_url = base_url
+        self.pagesize = pagesize
+        self.concurrency = max(1, concurrency)
+        self.bucket = TokenBucket(rate, burst or self.concurrency)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = session or make_session(self.concurrency)
+        self.cache = cache
+        self.params = {
+            "sitekey": "ID-Main",
+            "sourcesystem": "houston",
+            "locale": "id-ID",
+            "pagesize": pagesize,
+        }
+
+    def get_json(self, params, use_cache=True):
+        """
+        GET satu halaman (dari cache jika ada dan use_cache); error sementara
+        dicoba ulang dengan exponential backoff. Respons selalu disimpan ke cache.
+        """
+        if self.cache is not None and use_cache:
+            data = self.cache.get(params)
+            if data is not None:
+                return data
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            try:
+                resp = self.session.get(self.base_url, params=params, timeout=self.timeout)
+                if resp.status_code not in RETRY_STATUS:
+                    resp.raise_for_status()
+                    data = resp.json()
+                    if self.cache is not None:
+                        self.cache.put(params, resp.content)
+                    return data
+                error = f"HTTP {resp.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = str(e)
+            if attempt < self.retries:
+                delay = self.backoff * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, delay / 2))
+        raise FetchError(f"Gagal mengambil halaman {params.get('page')}: {error}")
+
+    def search(self):
+        """Request awal untuk mendapatkan userQueryId dan totalCount."""
+        data = self.get_json({**self.params, "page": 1}, use_cache=False)
+        user_query_id = data.get("userQueryId") or data.get("userqueryid")
+        total_count = int(data.get("totalCount", 0))
+        return user_query_id, total_count, data
+
+    def fetch_page(self, page, user_query_id):
+        data = self.get_json({**self.params, "page": page, "userqueryid": user_query_id})
+        return data.get("data", [])
+
+    def iter_pages(self, user_query_id, total_count, max_pages=100, start_page=1):
+        """
+        Hasilkan (page, jobs) berurutan dari start_page. Halaman diambil paralel
+        dalam jendela sebesar concurrency; berhenti di halaman kosong pertama.
+        """
+        last_page = min(max_pages, math.ceil(total_count / self.pagesize)) if total_count else max_pages
+        pages = iter(range(start_page, last_page + 1))
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            pending = []
+            for page in pages:
+                pending.append((page, pool.submit(self.fetch_page, page, user_query_id)))
+                if len(pending) >= self.concurrency:
+                    break
+            while pending:
+                page, future = pending.pop(0)
+                jobs = future.result()
+                if not jobs:
+                    for _, rest in pending:
+                        rest.cancel()
+                    return
+                next_page = next(pages, None)
+                if next_page is not None:
+                    pending.append((next_page, pool.submit(self.fetch_page, next_page, user_query_id)))
+                yield page, jobs
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,170 @@
+"""
+Pemeriksaan offline JobstreetFetcher terhadap server stub lokal (http.server).
+
+Server stub meniru endpoint pencarian (userQueryId, totalCount, data per
+halaman) dan bisa diatur agar halaman tertentu membalas 429/5xx. Yang dicek:
+- crawl paralel mengambil semua halaman sesuai totalCount,
+- rate limit token bucket (jarak antar request >= 1/rate),
+- retry dengan exponential backoff untuk 429/5xx,
+- FetchError setelah semua percobaan ulang habis.
+
+Tidak butuh akses jaringan. Keluar dengan kode 1 jika ada pemeriksaan gagal.
+
+Contoh:
+    python fetcher_check.py
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+from fetcher import FetchError, JobstreetFetcher
+
+
+class StubAPI:
+    """Status server stub: jumlah lowongan, rencana kegagalan per halaman, dan log request."""
+
+    def __init__(self, total=100, failures=None):
+        self.total = total
+        # page -> daftar status yang dikirim sebelum sukses; untuk page di
+        # self.always status pertama diulang terus (tidak pernah sukses)
+        self.failures = {page: list(statuses) for page, statuses in (failures or {}).items()}
+        self.always = set()
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def respond(self, params):
+        page = int(params.get("page", 1))
+        pagesize = int(params.get("pagesize", 32))
+        with self._lock:
+            self.requests.append((time.monotonic(), page))
+            pending = self.failures.get(page)
+            if pending:
+                status = pending[0] if page in self.always else pending.pop(0)
+                return status, {"error": "stub"}
+        start = (page - 1) * pagesize
+        data = [{"id": str(i), "title": f"Lowongan {i}", "teaser": "S1, 2 tahun pengalaman"}
+                for i in range(start, min(start + pagesize, self.total))]
+        return 200, {"userQueryId": "stub", "totalCount": self.total, "data": data}
+
+    def attempts(self, page):
+        with self._lock:
+            return [t for t, p in self.requests if p == page]
+
+
+def start_stub(api, host="127.0.0.1"):
+    """Jalankan server stub di port acak (thread daemon), kembalikan (server, base_url)."""
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            status, payload = api.respond(dict(parse_qsl(urlparse(self.path).query)))
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fetcher-stub", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/"
+
+
+def _run(api, **fetcher_kwargs):
+    server, base_url = start_stub(api)
+    fetcher = JobstreetFetcher(base_url=base_url, **fetcher_kwargs)
+    try:
+        user_query_id, total_count, _ = fetcher.search()
+        pages = list(fetcher.iter_pages(user_query_id, total_count))
+    finally:
+        fetcher.close()
+        server.shutdown()
+        server.server_close()
+    return user_query_id, total_count, pages
+
+
+def check_crawl():
+    """Semua halaman terambil berurutan dan crawl berhenti sesuai totalCount."""
+    api = StubAPI(total=100)
+    user_query_id, total_count, pages = _run(api, pagesize=10, concurrency=4, rate=1000)
+    ids = [job["id"] for _, jobs in pages for job in jobs]
+    assert user_query_id == "stub" and total_count == 100, (user_query_id, total_count)
+    assert [page for page, _ in pages] == list(range(1, 11)), [page for page, _ in pages]
+    assert ids == [str(i) for i in range(100)], "ID lowongan tidak lengkap/berurutan"
+    assert len(api.requests) == 11, f"{len(api.requests)} request (harus 1 search + 10 halaman)"
+
+
+def check_rate_limit(rate=20.0, total=200):
+    """Dengan burst 1, n request butuh minimal (n - 1) / rate detik."""
+    api = StubAPI(total=total)
+    _run(api, pagesize=10, concurrency=4, rate=rate, burst=1)
+    times = sorted(t for t, _ in api.requests)
+    elapsed = times[-1] - times[0]
+    minimum = (len(times) - 1) / rate
+    # Toleransi kecil untuk resolusi timer
+    assert elapsed >= minimum * 0.95, f"{len(times)} request dalam {elapsed:.3f} detik (minimal {minimum:.3f})"
+
+
+def check_backoff(backoff=0.05):
+    """429 lalu 503 di halaman 2 dicoba ulang dengan jeda eksponensial, lalu sukses."""
+    api = StubAPI(total=30, failures={2: [429, 503]})
+    _, _, pages = _run(api, pagesize=10, concurrency=2, rate=1000, retries=3, backoff=backoff)
+    assert [page for page, _ in pages] == [1, 2, 3], [page for page, _ in pages]
+    attempts = api.attempts(2)
+    assert len(attempts) == 3, f"halaman 2 diminta {len(attempts)} kali (harus 3)"
+    gaps = [b - a for a, b in zip(attempts, attempts[1:])]
+    for attempt, gap in enumerate(gaps):
+        assert gap >= backoff * 2 ** attempt, f"jeda retry ke-{attempt + 1} {gap:.3f} detik terlalu pendek"
+
+
+def check_retry_exhaustion(retries=2):
+    """Halaman yang selalu 500 menghasilkan FetchError setelah retries + 1 percobaan."""
+    api = StubAPI(total=30, failures={2: [500]})
+    api.always.add(2)
+    try:
+        _run(api, pagesize=10, concurrency=1, rate=1000, retries=retries, backoff=0.01)
+    except FetchError as e:
+        assert "500" in str(e), str(e)
+    else:
+        raise AssertionError("FetchError tidak dilempar")
+    attempts = len(api.attempts(2))
+    assert attempts == retries + 1, f"halaman 2 diminta {attempts} kali (harus {retries + 1})"
+
+
+CHECKS = {
+    'crawl': check_crawl,
+    'rate_limit': check_rate_limit,
+    'backoff': check_backoff,
+    'retry_exhaustion': check_retry_exhaustion,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pemeriksaan offline fetcher terhadap server stub lokal")
+    parser.add_argument('--only', nargs='+', choices=list(CHECKS), help="Jalankan sebagian pemeriksaan saja")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for name in args.only or CHECKS:
+        start = time.perf_counter()
+        try:
+            CHECKS[name]()
+        except AssertionError as e:
+            failed += 1
+            print(f"[ERROR] {name}: {e}")
+        except Exception as e:
+            failed += 1
+            print(f"[ERROR] {name}: {type(e).__name__}: {e}")
+        else:
+            print(f"[INFO] {name}: OK ({time.perf_counter() - start:.2f} detik)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Cache respons HTTP di disk dan mode record/replay untuk API pencarian Jobstreet.
+
+Setiap respons disimpan sebagai body mentah terkompresi gzip di
+<dir>/<kk>/<kunci>.json.gz, dengan kunci = SHA-256 dari parameter request
+yang sudah dinormalisasi. Parameter yang berubah tiap sesi (userqueryid)
+tidak ikut kunci, sehingga crawl ulang memakai halaman yang sama selama
+belum kedaluwarsa. Request pencarian awal (page 1, sumber totalCount dan
+userQueryId) tidak pernah dilayani dari cache. Entri lebih tua dari TTL
+dianggap miss, dan jika total ukuran melebihi max_bytes entri tertua dihapus
+sampai tersisa LOW_WATER x max_bytes.
+
+Mode record menulis semua respons tanpa TTL/batas ukuran. Folder rekaman
+bisa diputar ulang oleh server lokal yang meniru endpoint pencarian, jadi
+seluruh pipeline (fetch -> ekstrak -> tulis) bisa dijalankan dan di-benchmark
+offline dengan hasil yang deterministik:
+    python testing.py --record recordings/ --max-pages 20
+    python http_cache.py replay recordings/ --port 8765
+    python testing.py --base-url http://127.0.0.1:8765/ -o replay.csv
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+CACHE_DIR = "http_cache"
+CACHE_TTL = 6 * 3600
+MAX_BYTES = 256 * 1024 * 1024
+LOW_WATER = 0.9
+VOLATILE_PARAMS = {"userqueryid"}
+SUFFIX = ".json.gz"
+
+
+def request_key(params):
+    """Kunci cache dari parameter request (nama huruf kecil, nilai string, tanpa parameter volatil)."""
+    normalized = sorted((str(k).lower(), str(v)) for k, v in params.items()
+                        if str(k).lower() not in VOLATILE_PARAMS)
+    return hashlib.sha256(json.dumps(normalized).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Cache body respons di disk. ttl/max_bytes None berarti tanpa batas;
+    read=False (mode record) hanya menulis, tidak pernah melayani dari cache.
+    """
+
+    def __init__(self, directory=CACHE_DIR, ttl=CACHE_TTL, max_bytes=MAX_BYTES, read=True):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.read = read
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries()) if max_bytes else 0
+
+    @classmethod
+    def recorder(cls, directory):
+        return cls(directory, ttl=None, max_bytes=None, read=False)
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + SUFFIX)
+
+    def _entries(self):
+        """(path, mtime, ukuran) semua entri di folder cache."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(SUFFIX):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((path, st.st_mtime, st.st_size))
+        return entries
+
+    def get_raw(self, params):
+        """Body terkompresi (gzip) untuk params, atau None jika tidak ada/kedaluwarsa."""
+        if not self.read:
+            return None
+        path = self.path(request_key(params))
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                raise FileNotFoundError(path)
+            with open(path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return raw
+
+    def get(self, params):
+        """Respons JSON ter-decode untuk params, atau None jika miss."""
+        raw = self.get_raw(params)
+        if raw is None:
+            return None
+        try:
+            return json.loads(gzip.decompress(raw))
+        except (OSError, EOFError, ValueError):
+            # Entri rusak (mis. disk penuh saat menulis): anggap miss
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+            return None
+
+    def put(self, params, body):
+        """Simpan body respons (bytes) secara atomik."""
+        path = self.path(request_key(params))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        raw = gzip.compress(body, compresslevel=6, mtime=0)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+        try:
+            old = os.path.getsize(path)
+        except FileNotFoundError:
+            old = 0
+        os.replace(tmp, path)
+        if self.max_bytes:
+            with self._lock:
+                self._size += len(raw) - old
+                over = self._size > self.max_bytes
+            # Eviksi turun sampai low-water mark, jadi scan folder hanya terjadi
+            # sekali per (1 - LOW_WATER) x max_bytes data baru
+            if over and self._evict_lock.acquire(blocking=False):
+                try:
+                    self.evict(int(self.max_bytes * LOW_WATER))
+                finally:
+                    self._evict_lock.release()
+
+    def evict(self, target=None):
+        """
+        Hapus entri kedaluwarsa, lalu entri tertua sampai total <= target
+        (default max_bytes). Kembalikan jumlah entri yang dihapus.
+        """
+        target = self.max_bytes if target is None else target
+        now = time.time()
+        removed = 0
+        kept = []
+        for path, mtime, size in sorted(self._entries(), key=lambda e: e[1]):
+            if self.ttl is not None and now - mtime > self.ttl:
+                removed += self._remove(path)
+            else:
+                kept.append((path, size))
+        total = sum(size for _, size in kept)
+        for path, size in kept:
+            if not target or total <= target:
+                break
+            removed += self._remove(path)
+            total -= size
+        with self._lock:
+            self._size = total
+        return removed
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return 1
+        except FileNotFoundError:
+            return 0
+
+    def stats(self):
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(size for _, _, size in entries),
+                "hits": self.hits, "misses": self.misses}
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    cache = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        params = dict(parse_qsl(urlparse(self.path).query))
+        raw = self.cache.get_raw(params)
+        if raw is None:
+            body = json.dumps({"error": "halaman tidak ada di rekaman", "params": params}).encode()
+            self.send_response(404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        # Body dikirim apa adanya (sudah gzip), requests men-decode otomatis
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+def start_replay_server(directory, port=8765, host="127.0.0.1"):
+    """
+    Jalankan server pengganti API pencarian yang melayani respons rekaman
+    dari directory di thread daemon. Kembalikan (server, base_url).
+    """
+    handler = type("ReplayHandler", (_ReplayHandler,), {"cache": ResponseCache(directory, ttl=None, max_bytes=None)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="http-replay", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kelola cache respons HTTP dan putar ulang rekaman crawl")
+    sub = parser.add_subparsers(dest="command", required=True)
+    replay = sub.add_parser("replay", help="Jalankan server lokal yang melayani respons rekaman")
+    replay.add_argument("directory", help="Folder rekaman (python testing.py --record DIR)")
+    replay.add_argument("--host", default="127.0.0.1")
+    replay.add_argument("--port", type=int, default=8765)
+    stats = sub.add_parser("stats", help="Tampilkan jumlah entri dan ukuran cache")
+    stats.add_argument("directory", nargs="?", default=CACHE_DIR)
+    evict = sub.add_parser("evict", help="Hapus entri kedaluwarsa / melebihi batas ukuran")
+    evict.add_argument("directory", nargs="?", default=CACHE_DIR)
+    evict.add_argument("--ttl", type=float, default=CACHE_TTL, help="Umur maksimum entri (detik)")
+    evict.add_argument("--max-mb", type=float, default=MAX_BYTES / 2 ** 20, help="Ukuran maksimum cache (MB)")
+    args = parser.parse_args(argv)
+
+    if args.command == "replay":
+        server, base_url = start_replay_server(args.directory, args.port, args.host)
+        print(f"[INFO] Server replay berjalan di {base_url} ({ResponseCache(args.directory, None, None).stats()['entries']} respons)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+    elif args.command == "stats":
+        print(json.dumps(ResponseCache(args.directory, max_bytes=None).stats(), indent=2))
+    else:
+        cache = ResponseCache(args.directory, ttl=args.ttl, max_bytes=int(args.max_mb * 2 ** 20))
+        removed = cache.evict()
+        print(f"[INFO] {removed} entri dihapus, sisa {cache.stats()['bytes'] / 2 ** 20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
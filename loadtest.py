@@ -0,0 +1,110 @@
+"""
+Load test sederhana untuk service.py.
+
+Menjalankan sejumlah thread klien yang mengirim profil acak ke endpoint
+/predict atau /recommend, lalu melaporkan throughput dan latensi
+p50/p95/p99 (juga sebagai JSON dengan --json).
+
+Contoh:
+    python service.py --port 8000 &
+    python loadtest.py --url http://127.0.0.1:8000 --concurrency 32 --requests 5000
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import requests
+
+ROLES = ['Sales', 'Admin', 'Finance', 'Data Analyst', 'Customer Service', 'Tax', 'Lainnya']
+PENDIDIKAN = ['SMA', 'D3', 'S1', 'S2', 'S3']
+SKILLS = ['', 'Python', 'Python, SQL', 'Excel, Communication, SAP']
+
+
+def random_profile(rng):
+    return {
+        'role': rng.choice(ROLES),
+        'pendidikan': rng.choice(PENDIDIKAN),
+        'pengalaman': rng.randint(0, 30),
+        'skills': rng.choice(SKILLS),
+    }
+
+
+def run(url, endpoint='/predict', concurrency=16, total=2000, seed=0):
+    """Kirim total request dengan concurrency thread; kembalikan ringkasan hasil."""
+    latencies = []
+    errors = [0]
+    # 503 = layanan penuh (timeout antrean batch), 5xx lain = error server
+    statuses = Counter()
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def worker(worker_id):
+        rng = random.Random(seed + worker_id)
+        session = requests.Session()
+        local = []
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    break
+            start = time.perf_counter()
+            try:
+                resp = session.post(url + endpoint, json=random_profile(rng), timeout=30)
+                status = resp.status_code
+            except requests.RequestException:
+                status = 'connection_error'
+            local.append(time.perf_counter() - start)
+            with lock:
+                statuses[status] += 1
+                if status != 200:
+                    errors[0] += 1
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    lat_ms = np.array(latencies) * 1000
+    health = requests.get(url + '/health', timeout=5).json()
+    return {
+        'endpoint': endpoint,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'overloaded': statuses[503],
+        'statuses': {str(k): v for k, v in sorted(statuses.items(), key=str)},
+        'seconds': round(elapsed, 3),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(float(np.percentile(lat_ms, 50)), 2),
+        'p95_ms': round(float(np.percentile(lat_ms, 95)), 2),
+        'p99_ms': round(float(np.percentile(lat_ms, 99)), 2),
+        'avg_batch_size': round(health['items'] / health['batches'], 2) if health.get('batches') else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test layanan prediksi gaji")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--endpoint', default='/predict', choices=['/predict', '/recommend'])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--json', action='store_true', help="Cetak hasil sebagai JSON")
+    args = parser.parse_args(argv)
+    result = run(args.url, args.endpoint, args.concurrency, args.requests)
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for key, value in result.items():
+            print(f"{key:>15}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Cache prediksi gaji berdasarkan vektor fitur yang sudah dinormalisasi.
+
+Input model hanya role, jenjang pendidikan, tahun pengalaman, dan jumlah
+skill (usia dan lokasi tidak dipakai model), sehingga kombinasinya sedikit.
+Prediksi disimpan di cache LRU/TTL yang dipakai bersama semua sesi dan
+otomatis dikosongkan saat versi model/encoder berubah.
+
+Mode precompute (opsional) menghitung seluruh grid role x pendidikan x
+pengalaman x jumlah skill saat startup (per chunk GRID_CHUNK baris, seperti
+batch_predict, agar matriks fitur grid tidak dialokasikan sekaligus),
+sehingga hot path cukup berupa lookup array.
+
+Kurva gaji (salary_curve) menghitung seluruh grid pengalaman x pendidikan
+untuk satu role dan jumlah skill dengan satu panggilan predict, sebagai
+ganti satu prediksi per posisi slider.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import telemetry
+from features import count_skills, predict
+
+MAX_EXPERIENCE = 30
+MAX_SKILLS = 20
+GRID_CHUNK = 16384
+
+
+class CachedPredictor:
+    """Bungkus model + encoder dengan cache LRU/TTL dan grid precompute opsional."""
+
+    def __init__(self, model, encoder, version, maxsize=4096, ttl=3600, precompute=False,
+                 max_experience=MAX_EXPERIENCE, max_skills=MAX_SKILLS):
+        self.model = model
+        self.encoder = encoder
+        self.version = version
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_experience = max_experience
+        self.max_skills = max_skills
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # Role tak dikenal -> indeks terakhir (semua kolom kategori 0)
+        self.roles = list(encoder.category_index)
+        self.role_index = {role: i for i, role in enumerate(self.roles)}
+        self.pendidikan_codes = sorted(set(encoder.pendidikan_map.values()) | {-1})
+        self.pendidikan_index = {code: i for i, code in enumerate(self.pendidikan_codes)}
+        self.grid = self.precompute_grid() if precompute else None
+
+    def key(self, profile):
+        """Kunci ternormalisasi: (role, kode pendidikan, pengalaman, jumlah skill)."""
+        role = profile['role'] if profile['role'] in self.role_index else None
+        return (
+            role,
+            self.encoder.pendidikan_map.get(profile['pendidikan'], -1),
+            int(profile['pengalaman']),
+            count_skills(profile['skills']),
+        )
+
+    def _grid_lookup(self, key):
+        role, pendidikan, pengalaman, jumlah_skill = key
+        if not (0 <= pengalaman <= self.max_experience and 0 <= jumlah_skill <= self.max_skills):
+            return None
+        r = self.role_index[role] if role is not None else len(self.roles)
+        return float(self.grid[r, self.pendidikan_index[pendidikan], pengalaman, jumlah_skill])
+
+    def _predict_key(self, key):
+        role, pendidikan, pengalaman, jumlah_skill = key
+        with telemetry.span('preprocess'):
+            X = np.zeros((1, self.encoder.n_features))
+            row = X[0]
+            for col, value in (('Jumlah_Skill', jumlah_skill), ('Pendidikan_Encoded', pendidikan),
+                               ('Tahun Pengalaman', pengalaman)):
+                idx = self.encoder.index.get(col)
+                if idx is not None:
+                    row[idx] = value
+            if role is not None:
+                row[self.encoder.category_index[role]] = 1.0
+        with telemetry.span('model.predict'):
+            return float(predict(self.model, X)[0])
+
+    def predict(self, profile):
+        """Prediksi gaji untuk satu profil, memakai grid/cache bila tersedia."""
+        key = self.key(profile)
+        if self.grid is not None:
+            value = self._grid_lookup(key)
+            if value is not None:
+                with self._lock:
+                    self.hits += 1
+                return value
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and now - entry[1] < self.ttl:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        value = self._predict_key(key)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = (value, now)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return value
+
+    def salary_curve(self, role, skills):
+        """
+        Prediksi gaji untuk pengalaman 0..max_experience x semua jenjang
+        pendidikan (role dan skill tetap) sebagai DataFrame: index = tahun
+        pengalaman, kolom = jenjang pendidikan. Seluruh grid dihitung dengan
+        satu panggilan predict dan di-cache seperti prediksi tunggal.
+        """
+        role = role if role in self.role_index else None
+        jumlah_skill = count_skills(skills)
+        labels = list(self.encoder.pendidikan_map)
+        experience = np.arange(self.max_experience + 1)
+
+        if self.grid is not None and jumlah_skill <= self.max_skills:
+            r = self.role_index[role] if role is not None else len(self.roles)
+            cols = [self.pendidikan_index[self.encoder.pendidikan_map[label]] for label in labels]
+            values = self.grid[r, cols, :, jumlah_skill].T
+            with self._lock:
+                self.hits += 1
+            return pd.DataFrame(values, index=pd.Index(experience, name='Pengalaman'), columns=labels)
+
+        key = ('curve', role, jumlah_skill)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and now - entry[1] < self.ttl:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        with telemetry.span('preprocess'):
+            e, p = (a.ravel() for a in np.indices((len(experience), len(labels))))
+            X = np.zeros((e.size, self.encoder.n_features))
+            for col, values in (('Jumlah_Skill', jumlah_skill), ('Tahun Pengalaman', experience[e]),
+                                ('Pendidikan_Encoded', np.array([self.encoder.pendidikan_map[x] for x in labels])[p])):
+                idx = self.encoder.index.get(col)
+                if idx is not None:
+                    X[:, idx] = values
+            if role is not None:
+                X[:, self.encoder.category_index[role]] = 1.0
+        with telemetry.span('model.predict'):
+            values = predict(self.model, X).reshape(len(experience), len(labels))
+        curve = pd.DataFrame(values, index=pd.Index(experience, name='Pengalaman'), columns=labels)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = (curve, now)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return curve
+
+    def precompute_grid(self, chunk_size=GRID_CHUNK):
+        """
+        Hitung semua kombinasi fitur. Grid diproses per chunk_size baris:
+        satu matriks fitur berukuran chunk dipakai ulang untuk setiap
+        panggilan predict, bukan satu matriks untuk seluruh grid.
+        """
+        shape = (len(self.roles) + 1, len(self.pendidikan_codes),
+                 self.max_experience + 1, self.max_skills + 1)
+        size = int(np.prod(shape))
+        codes = np.asarray(self.pendidikan_codes)
+        role_cols = np.array([self.encoder.category_index[role] for role in self.roles], dtype=np.intp)
+        columns = [(self.encoder.index.get(col), col) for col in
+                   ('Jumlah_Skill', 'Pendidikan_Encoded', 'Tahun Pengalaman')]
+        grid = np.empty(size)
+        X = np.zeros((min(chunk_size, size), self.encoder.n_features))
+        with telemetry.span('precompute_grid'):
+            for start in range(0, size, chunk_size):
+                stop = min(start + chunk_size, size)
+                r, p, e, s = np.unravel_index(np.arange(start, stop), shape)
+                chunk = X[:stop - start]
+                chunk[:] = 0.0
+                values = {'Jumlah_Skill': s, 'Pendidikan_Encoded': codes[p], 'Tahun Pengalaman': e}
+                for idx, col in columns:
+                    if idx is not None:
+                        chunk[:, idx] = values[col]
+                known = r < len(self.roles)
+                chunk[np.flatnonzero(known), role_cols[r[known]]] = 1.0
+                grid[start:stop] = predict(self.model, chunk)
+        return grid.reshape(shape)
+
+    def stats(self):
+        """Jumlah hit/miss dan ukuran cache (dibaca di bawah lock yang sama dengan penulisnya)."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache)}
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_shared = None
+_shared_key = None
+_shared_lock = threading.Lock()
+
+
+def get_predictor(model, encoder, version, **kwargs):
+    """
+    Kembalikan CachedPredictor yang dipakai bersama semua sesi. Instance baru
+    dibuat (cache lama dibuang) jika versi model/encoder atau opsinya
+    (mis. precompute) berubah.
+    """
+    global _shared, _shared_key
+    version = (version, encoder.version)
+    key = (version, tuple(sorted(kwargs.items())))
+    with _shared_lock:
+        if _shared is None or _shared_key != key:
+            _shared = CachedPredictor(model, encoder, version, **kwargs)
+            _shared_key = key
+        return _shared
@@ -0,0 +1,145 @@
+"""
+Bangun ulang dataset bersih dari dump mentah hasil crawl, tanpa akses jaringan.
+
+Dump mentah ditulis oleh fetch_jobstreet_jobs (testing.py) ke folder raw/
+sebagai JSONL: satu baris per halaman {"page", "userQueryId", "data": [...]}.
+File .jsonl.gz dan baris berisi satu job mentah juga didukung. Job dibagi
+per chunk dan diekstrak paralel di semua core dengan process pool, lalu
+ditulis dengan skema kolom yang sama seperti jobstreet_jobs_cleaned_with_category.csv.
+Lowongan hampir duplikat dibuang (MinHash/LSH, lihat dedupe.py) kecuali
+dengan --no-dedupe, dan indeks signature-nya disimpan untuk crawl berikutnya.
+
+Contoh:
+    python rebuild.py raw/ -o jobstreet_jobs_cleaned_with_category.csv --workers 8
+"""
+import argparse
+import csv
+import glob
+import gzip
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from dataset import convert_csv, parquet_path
+from dedupe import MinHashIndex, index_path
+from testing import CSV_HEADER, iter_unique_jobs, job_to_row
+
+
+def find_raw_files(paths):
+    """Kumpulkan file dump (.jsonl/.jsonl.gz), terbaru lebih dulu."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += glob.glob(os.path.join(path, "*.jsonl"))
+            files += glob.glob(os.path.join(path, "*.jsonl.gz"))
+        else:
+            files.append(path)
+    # Nama file memuat timestamp crawl, jadi urutan terbalik = terbaru dulu
+    return sorted(files, reverse=True)
+
+
+def _open(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_raw_jobs(files):
+    """
+    Hasilkan job mentah unik (berdasarkan ID) dari file dump. Karena file
+    terbaru dibaca lebih dulu, versi job yang paling baru yang dipertahankan.
+    """
+    seen_ids = set()
+    for path in files:
+        with _open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                jobs = record["data"] if "data" in record else [record]
+                for job in jobs:
+                    job_id = str(job.get("id"))
+                    if job_id in seen_ids:
+                        continue
+                    seen_ids.add(job_id)
+                    yield job
+
+
+def iter_chunks(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def rows_for_chunk(jobs):
+    """Dijalankan di worker: ekstrak satu chunk job menjadi baris CSV."""
+    return [job_to_row(job) for job in jobs]
+
+
+def iter_unique(jobs, index, skipped):
+    """Versi iter_unique_jobs untuk aliran job tanpa nomor halaman."""
+    for _, unique in iter_unique_jobs(((None, [job]) for job in jobs), index, skipped):
+        index.commit()
+        yield from unique
+
+
+def rebuild(paths, out_csv, workers=None, chunk_size=2000, dedupe=True):
+    """Ekstrak ulang semua dump di paths ke out_csv, kembalikan jumlah baris."""
+    files = find_raw_files(paths)
+    if not files:
+        print("[ERROR] Tidak ada file dump mentah ditemukan")
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    total = 0
+    jobs = iter_raw_jobs(files)
+    index = MinHashIndex() if dedupe else None
+    skipped = {}
+    if index is not None:
+        jobs = iter_unique(jobs, index, skipped)
+    chunks = iter_chunks(jobs, chunk_size)
+    tmp = out_csv + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        # Batasi jumlah chunk yang sedang diproses agar memori tetap terkendali
+        pending = [pool.submit(rows_for_chunk, c) for c in itertools.islice(chunks, workers * 2)]
+        while pending:
+            rows = pending.pop(0).result()
+            writer.writerows(rows)
+            total += len(rows)
+            nxt = next(chunks, None)
+            if nxt is not None:
+                pending.append(pool.submit(rows_for_chunk, nxt))
+    os.replace(tmp, out_csv)
+    if index is not None:
+        index.save(index_path(out_csv))
+
+    elapsed = time.perf_counter() - start
+    print(f"[INFO] {total} lowongan dari {len(files)} file diekstrak ulang dalam {elapsed:.1f} detik -> {out_csv}"
+          f" ({sum(skipped.values())} hampir duplikat dibuang)")
+    if convert_csv(out_csv):
+        print(f"[INFO] Dataset bertipe disimpan ke {parquet_path(out_csv)}")
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bangun ulang dataset bersih dari dump mentah crawl")
+    parser.add_argument("paths", nargs="+", help="Folder atau file dump (.jsonl/.jsonl.gz)")
+    parser.add_argument("-o", "--output", default="jobstreet_jobs_cleaned_with_category.csv")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses (default: semua core)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Jumlah job per chunk")
+    parser.add_argument("--no-dedupe", action="store_true", help="Jangan buang lowongan hampir duplikat")
+    args = parser.parse_args(argv)
+    rebuild(args.paths, args.output, workers=args.workers, chunk_size=args.chunk_size, dedupe=not args.no_dedupe)
+
+
+if __name__ == "__main__":
+    main()
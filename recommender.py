@@ -0,0 +1,113 @@
+"""
+Indeks rekomendasi lowongan berdasarkan kedekatan gaji.
+
+Untuk setiap Kategori_Lowongan disimpan array Gaji_Rata yang sudah terurut
+beserta posisi barisnya di DataFrame. Query mencari titik sisip prediksi gaji
+dengan binary search, lalu melebar ke kiri/kanan (two-pointer) sampai
+mendapat n lowongan terdekat: O(log n + k) per query, tanpa filter, copy,
+dan sort seluruh DataFrame.
+
+Jika tersedia SkillIndex dan pengguna mengisi skill, skor akhir adalah
+campuran cosine similarity skill (satu perkalian matriks sparse x vektor)
+dan kedekatan gaji relatif; n teratas dipilih dengan argpartition.
+"""
+import numpy as np
+
+RESULT_COLUMNS = ['Title', 'Posisi', 'Gaji', 'Link', 'Kualifikasi', 'Skill', 'Salary_Diff', 'Skill_Score']
+SKILL_WEIGHT = 0.5
+
+
+class _SortedSalaries:
+    """Gaji terurut dari sekumpulan baris; gaji kosong disimpan terpisah."""
+
+    def __init__(self, positions, salaries):
+        positions = np.asarray(positions, dtype=np.intp)
+        values = salaries[positions]
+        valid = ~np.isnan(values)
+        order = np.argsort(values[valid], kind='stable')
+        self.salaries = values[valid][order]
+        self.positions = positions[valid][order]
+        # Baris tanpa gaji diletakkan paling akhir, sama seperti sort_values
+        self.missing = positions[~valid]
+        self.size = len(positions)
+
+    def nearest(self, target, n):
+        """Kembalikan (posisi, selisih) untuk n gaji terdekat dengan target."""
+        salaries = self.salaries
+        hi = int(np.searchsorted(salaries, target))
+        lo = hi - 1
+        picked = []
+        while len(picked) < n and (lo >= 0 or hi < len(salaries)):
+            if hi >= len(salaries) or (lo >= 0 and target - salaries[lo] <= salaries[hi] - target):
+                picked.append(lo)
+                lo -= 1
+            else:
+                picked.append(hi)
+                hi += 1
+
+        picked = np.asarray(picked, dtype=np.intp)
+        positions = self.positions[picked]
+        diffs = np.abs(salaries[picked] - target)
+        if len(picked) < n and len(self.missing):
+            extra = self.missing[:n - len(picked)]
+            positions = np.concatenate([positions, extra])
+            diffs = np.concatenate([diffs, np.full(len(extra), np.nan)])
+        return positions, diffs
+
+
+class RecommendationIndex:
+    """Indeks per kategori untuk mencari lowongan dengan gaji terdekat."""
+
+    def __init__(self, df, category_column='Kategori_Lowongan', salary_column='Gaji_Rata',
+                 skill_index=None, skill_weight=SKILL_WEIGHT):
+        self.df = df
+        self.salaries = df[salary_column].to_numpy(dtype=np.float64)
+        self.skill_index = skill_index
+        self.skill_weight = skill_weight
+        self._rows = df.groupby(category_column, sort=False, observed=True).indices
+        self._all = _SortedSalaries(np.arange(len(df)), self.salaries)
+        self._by_category = {
+            category: _SortedSalaries(positions, self.salaries)
+            for category, positions in self._rows.items()
+        }
+
+    def query(self, predicted_salary, role, n=5, skills=None):
+        """
+        Ambil n lowongan dengan Gaji_Rata paling dekat ke predicted_salary,
+        atau dengan skor campuran skill + gaji jika skills diisi dan indeks
+        skill tersedia.
+
+        Jika kategori role memiliki kurang dari n lowongan, pencarian
+        dilakukan pada semua lowongan.
+        """
+        bucket = self._by_category.get(role)
+        rows = self._rows.get(role)
+        if bucket is None or bucket.size < n:
+            bucket, rows = self._all, None
+
+        similarity = self.skill_index.scores(skills) if skills and self.skill_index is not None else None
+        if similarity is not None:
+            positions = self._top_blended(predicted_salary, similarity, rows, n)
+            diffs = np.abs(self.salaries[positions] - predicted_salary)
+            skill_scores = similarity[positions]
+        else:
+            positions, diffs = bucket.nearest(predicted_salary, n)
+            skill_scores = np.nan
+
+        recommended = self.df.iloc[positions].copy()
+        recommended['Salary_Diff'] = diffs
+        recommended['Skill_Score'] = skill_scores
+        return recommended[RESULT_COLUMNS]
+
+    def _top_blended(self, target, similarity, rows, n):
+        """Posisi n baris dengan skor skill_weight * similarity + (1 - skill_weight) * kedekatan gaji."""
+        salaries = self.salaries if rows is None else self.salaries[rows]
+        similarity = similarity if rows is None else similarity[rows]
+        closeness = 1 - np.abs(salaries - target) / max(target, 1.0)
+        closeness = np.nan_to_num(np.clip(closeness, 0, 1), nan=0.0)
+        score = self.skill_weight * similarity + (1 - self.skill_weight) * closeness
+
+        k = min(n, len(score))
+        top = np.argpartition(-score, k - 1)[:k]
+        top = top[np.argsort(-score[top], kind='stable')]
+        return top if rows is None else rows[top]
@@ -0,0 +1,219 @@
+"""
+Refresh model secara inkremental dari lowongan yang baru di-crawl.
+
+Hanya lowongan yang belum ada di snapshot training (dicocokkan lewat Link)
+yang dipakai. Urutan kolom encoder dipertahankan; kategori baru ditambahkan
+di akhir. Model lama dilanjutkan:
+- XGBoost: boosting diteruskan beberapa ronde di atas booster yang ada,
+- RandomForest: warm start, pohon baru dilatih dari lowongan baru.
+
+Training penuh (pencarian hyperparameter) hanya dijalankan jika:
+- ada kategori baru (jumlah fitur berubah, model lama tidak bisa
+  dilanjutkan),
+- PSI distribusi gaji lowongan baru vs data training > --psi-threshold,
+- RMSE model lama pada lowongan baru > --rmse-ratio x RMSE test terakhir,
+- belum ada snapshot training, atau --full.
+
+PSI dan RMSE baru dipakai jika ada minimal --min-drift-rows lowongan baru
+dengan gaji; kalau belum, refresh ditunda dan lowongan baru menumpuk
+sampai cukup (kecuali ada kategori baru). Setelah refresh inkremental,
+model dievaluasi ulang pada test split training dan r2/rmse/mae di
+model_metrics.pkl diperbarui.
+
+Contoh:
+    python refresh.py
+    python refresh.py --data jobstreet_jobs_cleaned_with_category.csv --boost-rounds 100
+"""
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+from xgboost import XGBRegressor
+
+from dataset import TRAIN_COLUMNS, load_dataset
+from features import ENCODER_PATH, FeatureEncoder, predict
+from train import (link_keys, load_snapshot, prepare_data, profile_frame,
+                   save_artifacts, target_bins, train)
+
+PSI_THRESHOLD = 0.2
+RMSE_RATIO = 1.25
+BOOST_ROUNDS = 50
+MIN_NEW_TREES = 10
+MIN_DRIFT_ROWS = 200
+
+
+def population_stability(edges, expected, y):
+    """Population Stability Index distribusi y terhadap proporsi bin expected."""
+    actual = np.clip(target_bins(y, edges), 1e-4, None)
+    expected = np.clip(expected, 1e-4, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def detect_drift(snapshot, model, X_new, y_new, observed, new_categories):
+    """
+    Hitung metrik drift lowongan baru terhadap snapshot training. PSI dan RMSE
+    hanya dihitung dari lowongan yang mencantumkan gaji (bukan hasil isi median).
+    """
+    drift = {'new_categories': sorted(new_categories), 'observed_rows': int(observed.sum()),
+             'psi': 0.0, 'rmse': 0.0, 'rmse_ratio': 0.0}
+    if observed.any():
+        rmse = float(np.sqrt(mean_squared_error(y_new[observed], predict(model, X_new[observed]))))
+        drift['psi'] = population_stability(snapshot['target_edges'], snapshot['target_hist'], y_new[observed])
+        drift['rmse'] = rmse
+        drift['rmse_ratio'] = rmse / snapshot['rmse'] if snapshot['rmse'] else float('inf')
+    return drift
+
+
+def holdout_mask(snapshot, keys, new, seed):
+    """
+    Mask lowongan di test split training. Snapshot lama tanpa test_keys:
+    split train.py (80/20, seed) direproduksi dari lowongan lama lalu
+    disimpan ke snapshot.
+    """
+    if 'test_keys' not in snapshot:
+        _, test_rows = train_test_split(np.flatnonzero(~new), test_size=0.2, random_state=seed)
+        snapshot['test_keys'] = np.unique(keys[test_rows])
+    return np.isin(keys, snapshot['test_keys']) & ~new
+
+
+def evaluate(model, X, y):
+    """Metrik test seperti di train.py untuk model yang sudah di-refresh."""
+    y_pred = predict(model, X)
+    return {
+        'r2': r2_score(y, y_pred),
+        'rmse': np.sqrt(mean_squared_error(y, y_pred)),
+        'mae': mean_absolute_error(y, y_pred),
+        'test_size': len(y),
+        'error_dist': (y_pred - y).tolist(),
+    }
+
+
+def continue_xgboost(model, X, y, boost_rounds, n_jobs):
+    """Tambah boost_rounds pohon di atas booster lama (dipotong di best_iteration)."""
+    booster = model.get_booster()
+    try:
+        booster = booster[:model.best_iteration + 1]
+    except AttributeError:
+        pass
+    updated = XGBRegressor(**{**model.get_params(), 'n_estimators': boost_rounds,
+                              'early_stopping_rounds': None, 'n_jobs': n_jobs})
+    updated.fit(X, y, xgb_model=booster, verbose=False)
+    return updated
+
+
+def warm_start_forest(model, X, y, n_rows, new_trees, n_jobs):
+    """Tambah pohon baru yang dilatih dari lowongan baru (sebanding porsi datanya)."""
+    n_old = len(model.estimators_)
+    if new_trees is None:
+        new_trees = max(MIN_NEW_TREES, round(n_old * len(y) / max(n_rows, 1)))
+    model.set_params(warm_start=True, n_estimators=n_old + new_trees, n_jobs=n_jobs)
+    model.fit(X, y)
+    model.set_params(warm_start=False)
+    return model
+
+
+def refresh(data_path=None, output_dir='.', n_jobs=None, seed=42, psi_threshold=PSI_THRESHOLD,
+            rmse_ratio=RMSE_RATIO, min_drift_rows=MIN_DRIFT_ROWS, boost_rounds=BOOST_ROUNDS, new_trees=None,
+            full=False, **train_kwargs):
+    start = time.perf_counter()
+    n_jobs = n_jobs or min(4, os.cpu_count() or 1)
+    snapshot = None if full else load_snapshot(output_dir)
+    encoder_path = os.path.join(output_dir, ENCODER_PATH)
+    base_columns = FeatureEncoder.load(encoder_path).columns if os.path.exists(encoder_path) else None
+    if snapshot is None:
+        print("[INFO] Snapshot training tidak ada (atau --full), menjalankan training penuh...")
+        return train(data_path, output_dir, n_jobs=n_jobs, seed=seed, base_columns=base_columns, **train_kwargs)
+
+    df, y = prepare_data(load_dataset(TRAIN_COLUMNS + ['Link'], data_path))
+    keys = link_keys(df['Link'])
+    new = ~np.isin(keys, snapshot['seen'])
+    if not new.any():
+        print("[INFO] Tidak ada lowongan baru sejak snapshot terakhir")
+        return None
+
+    df_new, y_new = df[new], y[new]
+    encoder = FeatureEncoder.load(encoder_path)
+    model_path = os.path.join(output_dir, 'best_salary_predictor.pkl')
+    model = joblib.load(model_path)
+    X_new = encoder.transform_frame(profile_frame(df_new))
+    new_categories = set(df_new['Kategori_Lowongan'].astype(str)) - set(encoder.category_index)
+    drift = detect_drift(snapshot, model, X_new, y_new, df_new['Gaji_Terisi'].to_numpy(), new_categories)
+    print(f"[INFO] {int(new.sum())} lowongan baru ({drift['observed_rows']} dengan gaji); PSI gaji {drift['psi']:.3f}, "
+          f"RMSE {drift['rmse']:.0f} ({drift['rmse_ratio']:.2f}x RMSE test), "
+          f"kategori baru: {len(new_categories)}")
+
+    if not new_categories and drift['observed_rows'] < min_drift_rows:
+        # Batch kecil membuat PSI/RMSE berisik; lowongan baru tidak masuk snapshot
+        # sehingga ikut dihitung lagi pada refresh berikutnya
+        print(f"[INFO] Baru {drift['observed_rows']} lowongan dengan gaji (< {min_drift_rows}), "
+              f"refresh ditunda sampai data baru cukup")
+        return None
+
+    reasons = []
+    if new_categories:
+        reasons.append(f"{len(new_categories)} kategori baru")
+    if drift['psi'] > psi_threshold:
+        reasons.append(f"PSI {drift['psi']:.3f} > {psi_threshold}")
+    if drift['rmse_ratio'] > rmse_ratio:
+        reasons.append(f"RMSE {drift['rmse_ratio']:.2f}x > {rmse_ratio}x")
+    if reasons:
+        print(f"[INFO] Drift terdeteksi ({', '.join(reasons)}), menjalankan training penuh...")
+        return train(data_path, output_dir, n_jobs=n_jobs, seed=seed, base_columns=encoder.columns,
+                     **train_kwargs)
+
+    if isinstance(model, XGBRegressor):
+        model = continue_xgboost(model, X_new, y_new, boost_rounds, n_jobs)
+    else:
+        model = warm_start_forest(model, X_new, y_new, snapshot['n_rows'], new_trees, n_jobs)
+
+    test = holdout_mask(snapshot, keys, new, seed)
+    metrics = joblib.load(os.path.join(output_dir, 'model_metrics.pkl'))
+    metrics.update(evaluate(model, encoder.transform_frame(profile_frame(df[test])), y[test]))
+    metrics['feature_importances'] = pd.DataFrame({
+        'Feature': encoder.columns,
+        'Importance': model.feature_importances_,
+    }).sort_values('Importance', ascending=False)
+    info = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'new_rows': int(new.sum()), **drift,
+            'test_r2': float(metrics['r2']), 'test_rmse': float(metrics['rmse']),
+            'seconds': time.perf_counter() - start}
+    metrics['last_refresh'] = info
+    snapshot['seen'] = np.union1d(snapshot['seen'], keys[new])
+    snapshot['n_rows'] += int(new.sum())
+    # Gerbang RMSE berikutnya dibandingkan dengan RMSE test model yang sekarang
+    snapshot['rmse'] = float(metrics['rmse'])
+    snapshot['refreshes'].append(info)
+    save_artifacts(model, encoder, metrics, snapshot, output_dir)
+
+    print(f"[INFO] Refresh inkremental {type(model).__name__} selesai dalam {info['seconds']:.1f} detik "
+          f"(test R2 {metrics['r2']:.4f}, RMSE {metrics['rmse']:.2f})")
+    return model, metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh model prediksi gaji dari lowongan baru")
+    parser.add_argument('--data', default=None, help="Path dataset (default: Parquet/CSV bawaan)")
+    parser.add_argument('--output-dir', default='.', help="Folder artefak model")
+    parser.add_argument('--n-jobs', type=int, default=None, help="Batas proses paralel (default: min(4, CPU))")
+    parser.add_argument('--psi-threshold', type=float, default=PSI_THRESHOLD,
+                        help="Batas PSI distribusi gaji untuk training penuh")
+    parser.add_argument('--rmse-ratio', type=float, default=RMSE_RATIO,
+                        help="Batas rasio RMSE lowongan baru vs RMSE test untuk training penuh")
+    parser.add_argument('--min-drift-rows', type=int, default=MIN_DRIFT_ROWS,
+                        help="Minimum lowongan baru dengan gaji sebelum PSI/RMSE dipakai (refresh ditunda)")
+    parser.add_argument('--boost-rounds', type=int, default=BOOST_ROUNDS, help="Ronde boosting tambahan (XGBoost)")
+    parser.add_argument('--new-trees', type=int, default=None,
+                        help="Jumlah pohon baru (RandomForest, default: sebanding porsi data baru)")
+    parser.add_argument('--full', action='store_true', help="Paksa training penuh")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+    refresh(args.data, args.output_dir, n_jobs=args.n_jobs, seed=args.seed, psi_threshold=args.psi_threshold,
+            rmse_ratio=args.rmse_ratio, min_drift_rows=args.min_drift_rows, boost_rounds=args.boost_rounds, new_trees=args.new_trees, full=args.full)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+Layanan HTTP JSON untuk prediksi gaji dan rekomendasi lowongan.
+
+Model, encoder, dan indeks rekomendasi dimuat sekali saat start. Request
+yang datang bersamaan digabung oleh MicroBatcher: worker mengumpulkan
+sampai max_batch profil atau menunggu paling lama max_wait_ms sejak profil
+pertama, lalu memanggil model.predict sekali untuk seluruh batch.
+
+Endpoint:
+    GET  /health
+    GET  /metrics    timing per stage (teks Prometheus, aktif dengan TELEMETRY=1)
+    POST /predict    {"role", "pendidikan", "pengalaman", "skills"}
+                     atau {"profiles": [...]} / [...] (semua prediksi dikembalikan,
+                     maksimal --max-profiles profil, lebih dari itu 413)
+                     503 jika antrean batch penuh/lambat (prediksi melebihi batas waktu)
+    POST /recommend  {"role", "pendidikan", "pengalaman", "skills", "n": 5}
+
+Contoh:
+    python service.py --port 8000 --max-batch 64 --max-wait-ms 5
+"""
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import telemetry
+from artifacts import load_feature_encoder, load_model, load_recommendation_index
+from features import PENDIDIKAN_MAP, predict
+
+REQUIRED_FIELDS = ('role', 'pendidikan', 'pengalaman', 'skills')
+MAX_PROFILES = 1024
+MAX_BODY_BYTES = 4 * 1024 * 1024
+RETRY_AFTER_SECONDS = 1
+
+
+class MicroBatcher:
+    """Gabungkan profil dari banyak request menjadi satu panggilan predict."""
+
+    def __init__(self, model, encoder, max_batch=64, max_wait_ms=5):
+        self.model = model
+        self.encoder = encoder
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        self.batches = 0
+        self.items = 0
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, profile):
+        """Masukkan satu profil ke antrean, kembalikan Future berisi prediksi gaji."""
+        future = Future()
+        self._queue.put((profile, future))
+        return future
+
+    def _collect(self):
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            try:
+                with telemetry.span('preprocess'):
+                    X = self.encoder.transform_many(profile for profile, _ in batch)
+                with telemetry.span('model.predict'):
+                    predictions = predict(self.model, X)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), value in zip(batch, predictions):
+                future.set_result(float(value))
+
+    def close(self):
+        self._stopped.set()
+        self._worker.join()
+
+
+def validate_profile(data):
+    """Cek field profil; kembalikan pesan error atau None."""
+    if not isinstance(data, dict):
+        return "profil harus berupa objek JSON"
+    missing = [f for f in REQUIRED_FIELDS if f not in data]
+    if missing:
+        return f"field wajib tidak ada: {', '.join(missing)}"
+    if not isinstance(data['role'], str):
+        return "role harus berupa string"
+    if not isinstance(data['skills'], str):
+        return "skills harus berupa string (dipisahkan koma)"
+    if isinstance(data['pengalaman'], bool) or not isinstance(data['pengalaman'], (int, float)):
+        return "pengalaman harus berupa angka"
+    if data['pendidikan'] not in PENDIDIKAN_MAP:
+        return f"pendidikan harus salah satu dari {', '.join(PENDIDIKAN_MAP)}"
+    return None
+
+
+def parse_profiles(data, max_profiles=MAX_PROFILES):
+    """
+    Ambil daftar profil dari body /predict: {"profiles": [...]}, list profil,
+    atau satu objek profil. Kembalikan (profiles, batch, error, status);
+    status 413 jika jumlah profil melebihi max_profiles.
+    """
+    if isinstance(data, dict) and 'profiles' in data:
+        profiles, batch = data['profiles'], True
+    elif isinstance(data, list):
+        profiles, batch = data, True
+    elif isinstance(data, dict):
+        profiles, batch = [data], False
+    else:
+        return None, False, "body harus berupa objek profil atau list profil", 400
+    if not isinstance(profiles, list) or not profiles:
+        return None, batch, "profiles harus berupa list yang tidak kosong", 400
+    if len(profiles) > max_profiles:
+        return None, batch, f"maksimal {max_profiles} profil per request ({len(profiles)} dikirim)", 413
+    for i, profile in enumerate(profiles):
+        error = validate_profile(profile)
+        if error:
+            return None, batch, f"profil ke-{i}: {error}" if batch else error, 400
+    return profiles, batch, None, 200
+
+
+def _clean(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class SalaryService:
+    """Logika endpoint, terpisah dari HTTP handler agar mudah dipakai ulang."""
+
+    def __init__(self, max_batch=64, max_wait_ms=5, timeout=10, max_profiles=MAX_PROFILES):
+        self.index = load_recommendation_index()
+        self.batcher = MicroBatcher(load_model(), load_feature_encoder(), max_batch, max_wait_ms)
+        self.timeout = timeout
+        self.max_profiles = max_profiles
+
+    def predict(self, profiles):
+        futures = [self.batcher.submit(p) for p in profiles]
+        return [f.result(timeout=self.timeout) for f in futures]
+
+    def recommend(self, profile, n=5):
+        predicted_salary = self.predict([profile])[0]
+        with telemetry.span('rekomendasi_lowongan'):
+            recommended = self.index.query(predicted_salary, profile['role'], n=n, skills=profile['skills'])
+        records = [{k: _clean(v) for k, v in row.items()} for row in recommended.to_dict('records')]
+        return predicted_salary, records
+
+    def stats(self):
+        return {'batches': self.batcher.batches, 'items': self.batcher.items}
+
+
+class Handler(BaseHTTPRequestHandler):
+    service = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self, length):
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _send_overloaded(self):
+        # Bukan bug: antrean micro-batch tidak sempat memproses dalam batas waktu
+        self._send(503, {'error': 'layanan sedang penuh, prediksi melebihi batas waktu'},
+                   headers={'Retry-After': str(RETRY_AFTER_SECONDS)})
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, {'status': 'ok', **self.service.stats()})
+        elif self.path == '/metrics':
+            body = telemetry.prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send(404, {'error': 'endpoint tidak ditemukan'})
+
+    def do_POST(self):
+        if self.path not in ('/predict', '/recommend'):
+            self._send(404, {'error': 'endpoint tidak ditemukan'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            # Body tidak dibaca, jadi koneksi ditutup setelah respons
+            self.close_connection = True
+            self._send(413 if length > 0 else 400,
+                       {'error': f'Content-Length harus antara 0 dan {MAX_BODY_BYTES} byte'},
+                       headers={'Connection': 'close'})
+            return
+        try:
+            data = self._read_json(length)
+        except (ValueError, UnicodeDecodeError):
+            self._send(400, {'error': 'body bukan JSON yang valid'})
+            return
+
+        if self.path == '/predict':
+            profiles, batch, error, status = parse_profiles(data, self.service.max_profiles)
+            if error:
+                self._send(status, {'error': error})
+                return
+            try:
+                predictions = self.service.predict(profiles)
+            except FutureTimeoutError:
+                self._send_overloaded()
+                return
+            except Exception as e:
+                self._send(500, {'error': f'prediksi gagal: {e}'})
+                return
+            if batch:
+                self._send(200, {'predicted_salaries': predictions})
+            else:
+                self._send(200, {'predicted_salary': predictions[0]})
+        else:
+            error = validate_profile(data)
+            if error:
+                self._send(400, {'error': error})
+                return
+            n = data.get('n', 5)
+            if isinstance(n, bool) or not isinstance(n, int) or n < 1:
+                self._send(400, {'error': 'n harus berupa bilangan bulat positif'})
+                return
+            try:
+                predicted_salary, records = self.service.recommend(data, n=n)
+            except FutureTimeoutError:
+                self._send_overloaded()
+                return
+            except Exception as e:
+                self._send(500, {'error': f'rekomendasi gagal: {e}'})
+                return
+            self._send(200, {'predicted_salary': predicted_salary, 'recommendations': records})
+
+
+def serve(host='127.0.0.1', port=8000, max_batch=64, max_wait_ms=5, max_profiles=MAX_PROFILES):
+    Handler.service = SalaryService(max_batch=max_batch, max_wait_ms=max_wait_ms, max_profiles=max_profiles)
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    print(f"[INFO] Layanan prediksi berjalan di http://{host}:{port} "
+          f"(max_batch={max_batch}, max_wait_ms={max_wait_ms})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        Handler.service.batcher.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan HTTP prediksi gaji & rekomendasi lowongan")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch', type=int, default=64, help="Maksimum profil per panggilan predict")
+    parser.add_argument('--max-wait-ms', type=float, default=5, help="Waktu tunggu maksimum untuk mengisi batch")
+    parser.add_argument('--max-profiles', type=int, default=MAX_PROFILES,
+                        help="Maksimum profil per request /predict (lebih dari itu dibalas 413)")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.max_batch, args.max_wait_ms, args.max_profiles)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Indeks skill sparse (TF-IDF) atas kolom Skill dan Kualifikasi semua lowongan.
+
+Teks dipecah per segmen (koma, titik koma, baris baru), lalu diambil token
+unigram dan bigram. Bobot tiap term adalah (1 + log tf) * idf dan setiap baris
+dinormalisasi L2, sehingga skor kecocokan dengan input skill pengguna adalah
+cosine similarity: satu perkalian matriks sparse x vektor yang hanya
+menyentuh kolom term yang ada di query.
+
+Matriks disimpan sebagai CSR di skill_index.npz bersama vocabulary, idf, dan
+hash dataset sumbernya. Buat ulang setelah dataset berubah:
+    python skill_index.py
+"""
+import json
+import math
+import re
+import sys
+from collections import Counter
+
+import numpy as np
+
+SKILL_INDEX_PATH = 'skill_index.npz'
+FORMAT_VERSION = 1
+TEXT_COLUMNS = ['Skill', 'Kualifikasi']
+
+SEGMENT_PATTERN = re.compile(r"[,;\n\r]+")
+# Pertahankan token seperti c++, c#, node.js
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+
+
+def analyze(text):
+    """Pecah teks menjadi term unigram + bigram (bigram tidak melewati koma)."""
+    terms = []
+    for segment in SEGMENT_PATTERN.split(text.lower()):
+        tokens = TOKEN_PATTERN.findall(segment)
+        terms.extend(tokens)
+        terms.extend(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return terms
+
+
+def job_texts(df, columns=TEXT_COLUMNS):
+    """Gabungkan kolom teks lowongan (nilai kosong dilewati) menjadi satu string per baris."""
+    parts = [df[c].fillna('').astype(str) for c in columns if c in df]
+    if not parts:
+        return [''] * len(df)
+    text = parts[0]
+    for part in parts[1:]:
+        text = text + '\n' + part
+    return text.tolist()
+
+
+class SkillIndex:
+    """Matriks TF-IDF (CSR, baris = lowongan) dan vocabulary-nya."""
+
+    def __init__(self, matrix, vocabulary, idf, source_hash=None):
+        self.matrix = matrix.tocsr()
+        self.terms = list(vocabulary)
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.source_hash = source_hash
+        self._csc = None
+
+    @property
+    def n_postings(self):
+        return self.matrix.shape[0]
+
+    @classmethod
+    def build(cls, texts, min_df=2, max_df=0.5, source_hash=None):
+        """
+        Bangun indeks dari list teks. Term yang muncul di kurang dari min_df
+        lowongan atau di lebih dari max_df (proporsi) lowongan dibuang.
+        """
+        import scipy.sparse as sp
+
+        n_docs = len(texts)
+        doc_freq = Counter()
+        for text in texts:
+            doc_freq.update(set(analyze(text)))
+        max_count = max_df * n_docs
+        vocabulary = sorted(t for t, c in doc_freq.items() if min_df <= c <= max_count)
+        term_index = {t: i for i, t in enumerate(vocabulary)}
+        idf = np.array([math.log((1 + n_docs) / (1 + doc_freq[t])) + 1 for t in vocabulary])
+
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            counts = Counter(term_index[t] for t in analyze(text) if t in term_index)
+            cols = sorted(counts)
+            indices.extend(cols)
+            data.extend(1 + math.log(counts[c]) for c in cols)
+            indptr.append(len(indices))
+
+        matrix = sp.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(n_docs, len(vocabulary)),
+        )
+        matrix = matrix @ sp.diags(idf)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        matrix = sp.diags(1 / norms) @ matrix
+        return cls(matrix.tocsr(), vocabulary, idf, source_hash)
+
+    @classmethod
+    def from_frame(cls, df, source_hash=None, **kwargs):
+        return cls.build(job_texts(df), source_hash=source_hash, **kwargs)
+
+    def vectorize(self, skills):
+        """Vektor query ter-normalisasi sebagai (indeks term, bobot); kosong jika tak ada term dikenal."""
+        counts = Counter(self.vocabulary[t] for t in analyze(skills or '') if t in self.vocabulary)
+        if not counts:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        cols = np.fromiter(counts, dtype=np.intp, count=len(counts))
+        weights = np.array([1 + math.log(counts[c]) for c in cols]) * self.idf[cols]
+        return cols, weights / np.linalg.norm(weights)
+
+    def scores(self, skills):
+        """Cosine similarity input skill terhadap semua lowongan, atau None jika tak ada term dikenal."""
+        cols, weights = self.vectorize(skills)
+        if not len(cols):
+            return None
+        if self._csc is None:
+            self._csc = self.matrix.tocsc()
+        return self._csc[:, cols] @ weights
+
+    def save(self, path=SKILL_INDEX_PATH):
+        meta = {'version': FORMAT_VERSION, 'source_hash': self.source_hash, 'shape': list(self.matrix.shape)}
+        np.savez_compressed(
+            path, data=self.matrix.data, indices=self.matrix.indices, indptr=self.matrix.indptr,
+            terms=np.array(self.terms, dtype=str), idf=self.idf, meta=np.array(json.dumps(meta)),
+        )
+
+    @classmethod
+    def load(cls, path=SKILL_INDEX_PATH):
+        # scipy di-import di sini agar tidak memperlambat startup app
+        import scipy.sparse as sp
+
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != FORMAT_VERSION:
+                raise ValueError(f"Versi indeks skill {meta.get('version')} tidak didukung, buat ulang {path}")
+            matrix = sp.csr_matrix((data['data'], data['indices'], data['indptr']), shape=tuple(meta['shape']))
+            terms = data['terms'].tolist()
+            idf = data['idf']
+        return cls(matrix, terms, idf, meta.get('source_hash'))
+
+
+if __name__ == "__main__":
+    from artifacts import cached_file_hash, load_jobs
+    from dataset import dataset_path
+
+    source = sys.argv[1] if len(sys.argv) > 1 else dataset_path()
+    out_path = sys.argv[2] if len(sys.argv) > 2 else SKILL_INDEX_PATH
+    index = SkillIndex.from_frame(load_jobs(source), source_hash=cached_file_hash(source))
+    index.save(out_path)
+    print(f"[INFO] Indeks skill {index.matrix.shape[0]} lowongan x {len(index.terms)} term "
+          f"({index.matrix.nnz} nilai) disimpan ke {out_path}")
@@ -0,0 +1,205 @@
+"""
+Instrumentasi ringan untuk hot path aplikasi (load artefak, preprocessing,
+model.predict, rekomendasi, render grafik).
+
+Setiap stage dibungkus span(); durasinya diagregasi per proses (p50/p95/p99
+dari jendela sampel terakhir) dan, jika ada run aktif, dicatat juga per
+rerun Streamlit untuk panel debug di sidebar.
+
+Aktifkan dengan environment variable:
+    TELEMETRY=1                 aktifkan pencatatan
+    TELEMETRY_LOG=timings.jsonl tambahkan timing tiap rerun ke file JSONL
+    TELEMETRY_PORT=9100         endpoint /metrics (format teks Prometheus)
+                                dan /metrics.json
+
+Saat tidak aktif, span() hanya mengembalikan context manager kosong yang
+sama, sehingga overhead-nya praktis nol.
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+WINDOW_SIZE = 4096
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC_NAME = 'cariin_stage_seconds'
+
+_enabled = os.environ.get('TELEMETRY') == '1'
+_log_path = os.environ.get('TELEMETRY_LOG')
+_stages = {}
+_lock = threading.Lock()
+_local = threading.local()
+_server = None
+_NOOP = contextlib.nullcontext()
+
+
+class _Stage:
+    __slots__ = ('count', 'total', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=WINDOW_SIZE)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+
+
+class _Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def enabled():
+    return _enabled
+
+
+def enable(flag=True, log_path=None):
+    """Aktifkan/nonaktifkan telemetry saat runtime (mis. dari skrip atau test manual)."""
+    global _enabled, _log_path
+    _enabled = flag
+    if log_path is not None:
+        _log_path = log_path
+
+
+def span(name):
+    """Context manager yang mengukur durasi blok kode sebagai stage `name`."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name)
+
+
+def timed(name):
+    """Decorator versi span() untuk seluruh pemanggilan fungsi."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record(name, seconds):
+    """Catat satu durasi (detik) untuk stage `name`."""
+    with _lock:
+        stage = _stages.get(name)
+        if stage is None:
+            stage = _stages[name] = _Stage()
+        stage.add(seconds)
+    records = getattr(_local, 'records', None)
+    if records is not None:
+        records.append((name, seconds))
+
+
+def start_run():
+    """Mulai pencatatan timing untuk satu rerun di thread ini."""
+    if _enabled:
+        _local.records = []
+
+
+def end_run():
+    """
+    Akhiri rerun: kembalikan daftar (stage, detik) milik rerun ini dan
+    tambahkan ke file JSONL jika TELEMETRY_LOG di-set.
+    """
+    records = getattr(_local, 'records', None) or []
+    _local.records = None
+    if records and _log_path:
+        line = json.dumps({
+            'timestamp': time.time(),
+            'stages': [{'stage': name, 'ms': round(seconds * 1000, 3)} for name, seconds in records],
+        })
+        with _lock, open(_log_path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+    return records
+
+
+def summary():
+    """Agregat per stage: jumlah, total detik, dan p50/p95/p99 (detik)."""
+    with _lock:
+        snapshot = {name: (s.count, s.total, np.fromiter(s.samples, dtype=float))
+                    for name, s in _stages.items()}
+    result = {}
+    for name, (count, total, samples) in sorted(snapshot.items()):
+        quantiles = np.quantile(samples, QUANTILES) if samples.size else [0.0] * len(QUANTILES)
+        result[name] = {
+            'count': count,
+            'sum': total,
+            **{f'p{int(q * 100)}': float(v) for q, v in zip(QUANTILES, quantiles)},
+        }
+    return result
+
+
+def prometheus_text():
+    """Agregat dalam format teks eksposisi Prometheus (tipe summary)."""
+    lines = [f'# HELP {METRIC_NAME} Durasi stage hot path aplikasi',
+             f'# TYPE {METRIC_NAME} summary']
+    for name, stats in summary().items():
+        label = name.replace('\\', '\\\\').replace('"', '\\"')
+        for q in QUANTILES:
+            lines.append(f'{METRIC_NAME}{{stage="{label}",quantile="{q}"}} {stats[f"p{int(q * 100)}"]:.6g}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{label}"}} {stats["sum"]:.6g}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{label}"}} {stats["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            body, content_type = prometheus_text().encode(), 'text/plain; version=0.0.4'
+        elif self.path == '/metrics.json':
+            body, content_type = json.dumps(summary()).encode(), 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_http_server(port, host='127.0.0.1'):
+    """Jalankan endpoint /metrics di thread daemon (sekali per proses)."""
+    global _server
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name='telemetry-http', daemon=True).start()
+            print(f"[INFO] Endpoint telemetry berjalan di http://{host}:{port}/metrics")
+    return _server
+
+
+if _enabled and os.environ.get('TELEMETRY_PORT'):
+    try:
+        start_http_server(int(os.environ['TELEMETRY_PORT']))
+    except OSError as e:
+        print(f"[WARN] Endpoint telemetry tidak bisa dijalankan: {e}")
@@ -1,7 +1,15 @@
-import requests
+import argparse
 import csv
-import time
+import json
+import os
 import re
+import time
+
+from dataset import convert_csv, parquet_path
+from dedupe import index_path, job_text, load_or_build_index
+from extraction import get_engine
+from fetcher import BASE_URL, JobstreetFetcher
+from http_cache import CACHE_DIR, CACHE_TTL, ResponseCache
 
 job_categories = [
     "software engineer", "frontend", "backend", "fullstack", "mobile developer", 
@@ -39,16 +47,15 @@ job_categories = [
     "civil engineer", "mechanic", "technician", "chef", "hotel", "event"
 ]
 
+# Semua pola dikompilasi sekali dan dipakai ulang untuk setiap lowongan
+engine = get_engine(tuple(job_categories))
+
 def assign_category(text, categories):
     """
     Mengembalikan kategori yang cocok dari daftar categories jika ditemukan di text.
     Jika tidak ada yang cocok, mengembalikan 'Lainnya'.
     """
-    text = str(text).lower()
-    for cat in categories:
-        if cat.lower() in text:
-            return cat.title()
-    return "Lainnya"
+    return get_engine(tuple(categories)).category(text)
 
 def parse_salary(s):
     """Ekstrak gaji min dan max dari string gaji."""
@@ -63,110 +70,273 @@ def parse_salary(s):
 
 def extract_experience(text):
     """Ambil tahun pengalaman kerja, hanya jika ada kata kunci pengalaman/experience."""
-    if not text: return None
-    patterns = [
-        r'(?:pengalaman|experience|berpengalaman|years of experience|work experience)[^\d]{0,20}(\d+)\s*(?:tahun|years?)',
-        r'min(?:imum)?\.?\s*(\d+)\s*(?:tahun|years?)\s*(?:pengalaman|experience)?',
-    ]
-    for pat in patterns:
-        m = re.search(pat, text, re.IGNORECASE)
-        if m: return int(m.group(1))
-    return None
+    return engine.experience(text)
 
 def extract_age(text):
     """Ambil usia, hanya jika ada kata kunci usia/umur/age."""
-    if not text: return None
-    patterns = [
-        r'(?:usia|max(?:imal)?|umur|berusia|age)[^\d]{0,20}(\d+)\s*(?:tahun|years?)',
-    ]
-    for pat in patterns:
-        m = re.search(pat, text, re.IGNORECASE)
-        if m: return int(m.group(1))
-    return None
+    return engine.age(text)
 
 def extract_education(text):
     """Ekstrak jenjang pendidikan dari kualifikasi."""
-    if not text: return None
-    degrees = ["S1", "S2", "D3", "Diploma", "Bachelor", "Master", "Sarjana", "SMK", "SMA"]
-    found = [d for d in degrees if re.search(r'\b{}\b'.format(d), text, re.IGNORECASE)]
-    if found:
-        return ",".join(found)
-    return None
+    return engine.education(text)
 
 def extract_skills(text):
     """Ekstrak skill utama dari kualifikasi."""
-    if not text: return None
-    skills = ["excel", "python", "sap", "finance", "accounting", "sql", "communication", "microsoft office", "erp", "tax", "java", "jira"]
-    found = [s for s in skills if s.lower() in text.lower()]
-    return ",".join(found) if found else None
-
-def fetch_jobstreet_jobs(max_pages=100, pagesize=32, out_csv="jobstreet_jobs_cleaned_with_category.csv"):
-    BASE_URL = "https://id.jobstreet.com/api/jobsearch/v5/search"
-    HEADERS = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-        "Referer": "https://id.jobstreet.com/id/jobs",
-        
-    }
-    params = {
-        "sitekey": "ID-Main",
-        "sourcesystem": "houston",
-        "locale": "id-ID",
-        "page": 1,
-        "pagesize": pagesize,
-    }
-
-    resp = requests.get(BASE_URL, headers=HEADERS, params=params)
-    data = resp.json()
-    userQueryId = data.get("userQueryId") or data.get("userqueryid")
-    total_count = int(data.get("totalCount", 0))
-    print(f"[INFO] Total lowongan ditemukan: {total_count}")
-
-    if not userQueryId:
-        print("[ERROR] Tidak dapat userQueryId!")
-        print(data)
-        return
-
-    all_jobs = []
-    for page in range(1, max_pages + 1):
-        params["page"] = page
-        params["userqueryid"] = userQueryId
-        resp = requests.get(BASE_URL, headers=HEADERS, params=params)
-        data = resp.json()
-        jobs = data.get("data", [])
-        if not jobs:
-            print("[INFO] No more jobs found, stopping.")
-            break
-        all_jobs.extend(jobs)
-        print(f"[INFO] Page {page}: total jobs so far: {len(all_jobs)}")
-        time.sleep(1)
-        if len(all_jobs) >= total_count:
-            break
-
-    with open(out_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            "Kategori Lowongan", "Pekerjaan Lowongan", "Title", "Posisi", "Gaji", "Gaji Min", "Gaji Max",
-            "Kualifikasi", "Tahun Pengalaman", "Umur", "Pendidikan", "Skill", "Link"
-        ])
-        for job in all_jobs:
-            title = job.get("title", "")
-            posisi = title
-            salary_str = job.get("salaryLabel") or job.get("salary", {}).get("display") or "Tidak dicantumkan"
-            gaji_min, gaji_max = parse_salary(salary_str)
-            kualifikasi = job.get("teaser", "") or ""
-            tahun_pengalaman = extract_experience(kualifikasi)
-            umur = extract_age(kualifikasi)
-            pendidikan = extract_education(kualifikasi)
-            skill = extract_skills(kualifikasi)
-            kategori_lowongan = assign_category(f"{title} {kualifikasi}", job_categories)
-            pekerjaan_lowongan = kategori_lowongan
-            link = f"https://id.jobstreet.com/id/job/{job.get('id')}"
-            writer.writerow([
-                kategori_lowongan, pekerjaan_lowongan, title, posisi, salary_str, gaji_min or "N/A", gaji_max or "N/A",
-                kualifikasi if kualifikasi else "N/A", tahun_pengalaman or "N/A", umur or "N/A",
-                pendidikan or "N/A", skill or "N/A", link
-            ])
-    print(f"[INFO] Saved {len(all_jobs)} cleaned jobs with category to {out_csv}")
+    return engine.skill(text)
+
+CSV_HEADER = [
+    "Kategori_Lowongan", "Pekerjaan Lowongan", "Title", "Posisi", "Gaji", "Gaji Min", "Gaji Max",
+    "Kualifikasi", "Tahun Pengalaman", "Umur", "Pendidikan", "Skill", "Link"
+]
+JOB_LINK = "https://id.jobstreet.com/id/job/{}"
+
+def job_to_row(job):
+    """Ubah satu job mentah dari API menjadi baris CSV yang sudah dibersihkan."""
+    title = job.get("title", "")
+    posisi = title
+    salary_str = job.get("salaryLabel") or job.get("salary", {}).get("display") or "Tidak dicantumkan"
+    gaji_min, gaji_max = parse_salary(salary_str)
+    kualifikasi = job.get("teaser", "") or ""
+    record = engine.extract(title, kualifikasi)
+    kategori_lowongan = record["Kategori Lowongan"]
+    pekerjaan_lowongan = kategori_lowongan
+    link = JOB_LINK.format(job.get('id'))
+    return [
+        kategori_lowongan, pekerjaan_lowongan, title, posisi, salary_str, gaji_min or "N/A", gaji_max or "N/A",
+        kualifikasi if kualifikasi else "N/A", record["Tahun Pengalaman"] or "N/A", record["Umur"] or "N/A",
+        record["Pendidikan"] or "N/A", record["Skill"] or "N/A", link
+    ]
+
+def checkpoint_path(out_csv):
+    return out_csv + ".checkpoint.json"
+
+def seen_ids_path(out_csv):
+    return out_csv + ".checkpoint.ids"
+
+def _truncate(path, size):
+    """Potong file ke size byte (data yang ditulis setelah checkpoint terakhir); True jika dipotong."""
+    if size is None or not os.path.exists(path) or os.path.getsize(path) <= size:
+        return False
+    with open(path, "r+b") as f:
+        f.truncate(size)
+    return True
+
+def load_checkpoint(out_csv):
+    """
+    Baca checkpoint crawl. ID job yang sudah tersimpan ada di <csv>.checkpoint.ids
+    (satu ID per baris, hanya di-append); checkpoint mencatat berapa byte file
+    ID dan CSV yang sah, sisanya dari halaman yang terputus dibuang. Jika
+    belum ada checkpoint tetapi CSV sudah ada, ID job diambil dari kolom Link
+    agar crawl berikutnya hanya append.
+    """
+    path = checkpoint_path(out_csv)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        if "seen_ids" in state:
+            # Format lama: semua ID di dalam checkpoint, dipindah ke file ID saat disimpan
+            state["new_ids"] = list(state["seen_ids"])
+            state["ids_bytes"] = 0
+        else:
+            state["new_ids"] = []
+        _truncate(seen_ids_path(out_csv), state["ids_bytes"])
+        state["seen_ids"] = set(state["new_ids"])
+        if os.path.exists(seen_ids_path(out_csv)):
+            with open(seen_ids_path(out_csv), encoding="utf-8") as f:
+                state["seen_ids"].update(line.strip() for line in f if line.strip())
+        if not state["complete"] and _truncate(out_csv, state.get("csv_bytes")):
+            print(f"[WARN] Baris setelah checkpoint terakhir dibuang dari {out_csv}")
+        return state
+
+    seen_ids = set()
+    if os.path.exists(out_csv):
+        with open(out_csv, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                link = row.get("Link") or ""
+                seen_ids.add(link.rsplit("/", 1)[-1])
+    _truncate(seen_ids_path(out_csv), 0)
+    return {"userQueryId": None, "total_count": 0, "last_page": 0, "complete": True,
+            "seen_ids": seen_ids, "new_ids": sorted(seen_ids), "ids_bytes": 0}
+
+def save_checkpoint(out_csv, state):
+    """
+    Append ID job baru ke file ID (fsync), lalu tulis checkpoint secara atomik
+    (file sementara lalu rename). Checkpoint hanya berisi posisi crawl dan
+    ukuran file yang sudah tersimpan, jadi biayanya tidak tumbuh dengan dataset.
+    """
+    if state["new_ids"]:
+        with open(seen_ids_path(out_csv), "ab") as f:
+            f.write("".join(f"{job_id}\n" for job_id in state["new_ids"]).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            state["ids_bytes"] = f.tell()
+        # Dikosongkan di tempat: list yang sama diisi oleh iter_new_jobs
+        state["new_ids"].clear()
+    path = checkpoint_path(out_csv)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({k: v for k, v in state.items() if k not in ("seen_ids", "new_ids")}, f)
+    os.replace(tmp, path)
+
+def raw_dump_path(raw_dir, userQueryId):
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(raw_dir, f"raw_{stamp}_{userQueryId}.jsonl")
+
+def iter_dump_raw(pages, raw_path, userQueryId):
+    """Simpan payload mentah setiap halaman (satu baris JSON per halaman) untuk rebuild offline."""
+    os.makedirs(os.path.dirname(raw_path) or ".", exist_ok=True)
+    with open(raw_path, "a", encoding="utf-8") as f:
+        for page, jobs in pages:
+            f.write(json.dumps({"page": page, "userQueryId": userQueryId, "data": jobs}, ensure_ascii=False) + "\n")
+            f.flush()
+            yield page, jobs
+
+def iter_new_jobs(pages, seen_ids, new_ids=None):
+    """
+    Lewati job yang ID-nya sudah pernah disimpan, hasilkan (page, jobs baru).
+    ID baru juga dicatat di new_ids (jika diisi) untuk disimpan di checkpoint.
+    """
+    for page, jobs in pages:
+        new_jobs = []
+        for job in jobs:
+            job_id = str(job.get("id"))
+            if job_id not in seen_ids:
+                seen_ids.add(job_id)
+                if new_ids is not None:
+                    new_ids.append(job_id)
+                new_jobs.append(job)
+        yield page, new_jobs
+
+def iter_unique_jobs(pages, index, skipped):
+    """
+    Lewati job yang hampir sama (judul + teaser) dengan job yang sudah ada di
+    indeks MinHash. Job unik hanya di-stage; pemanggil memanggil
+    index.commit() setelah halamannya ditulis, agar indeks tidak memuat job
+    yang belum masuk CSV.
+    """
+    for page, jobs in pages:
+        unique = []
+        for job in jobs:
+            text = job_text(job.get("title"), job.get("teaser"))
+            if index.check_and_add(str(job.get("id")), text, stage=True) is None:
+                unique.append(job)
+            else:
+                skipped[page] = skipped.get(page, 0) + 1
+        yield page, unique
+
+def fetch_jobstreet_jobs(max_pages=100, pagesize=32, out_csv="jobstreet_jobs_cleaned_with_category.csv",
+                         base_url=BASE_URL, concurrency=8, rate=8.0, resume=True, raw_dir="raw", dedupe=True,
+                         cache_dir=None, cache_ttl=CACHE_TTL, record_dir=None):
+    """
+    Crawl lowongan dan tulis ke CSV per halaman (fetch -> ekstrak -> tulis).
+
+    Setelah setiap halaman ditulis, checkpoint (halaman terakhir, userQueryId,
+    ukuran CSV) diperbarui dan ID job baru di-append ke file ID. Crawl yang
+    terputus dilanjutkan dari halaman berikutnya, dan job yang sudah ada di
+    CSV tidak ditulis ulang.
+
+    Jika raw_dir diisi, payload mentah setiap halaman juga disimpan sebagai
+    JSONL agar dataset bisa dibangun ulang offline dengan rebuild.py.
+
+    Jika dedupe aktif, job yang hampir sama dengan job yang sudah tersimpan
+    (MinHash judul + teaser, lihat dedupe.py) tidak ditulis. Indeks
+    signature disimpan di samping CSV (append per halaman, compaction
+    berkala) sehingga crawl berikutnya dicek secara inkremental.
+
+    Jika cache_dir diisi, respons halaman di-cache di sana selama cache_ttl
+    detik sehingga crawl ulang tidak mengunduh ulang halaman yang sama
+    (pencarian awal tetap selalu diambil langsung). Default tanpa cache. Jika
+    record_dir diisi, semua respons direkam ke sana (tanpa membaca cache)
+    untuk diputar ulang dengan `python http_cache.py replay record_dir`.
+    """
+    state = load_checkpoint(out_csv)
+    index = load_or_build_index(out_csv) if dedupe else None
+    skipped = {}
+    if record_dir:
+        cache = ResponseCache.recorder(record_dir)
+    elif cache_dir:
+        cache = ResponseCache(cache_dir, ttl=cache_ttl)
+    else:
+        cache = None
+    fetcher = JobstreetFetcher(base_url=base_url, pagesize=pagesize, concurrency=concurrency, rate=rate,
+                               cache=cache)
+    try:
+        if resume and not state["complete"] and state["userQueryId"]:
+            userQueryId, total_count = state["userQueryId"], state["total_count"]
+            print(f"[INFO] Melanjutkan crawl dari page {state['last_page'] + 1}")
+        else:
+            userQueryId, total_count, data = fetcher.search()
+            print(f"[INFO] Total lowongan ditemukan: {total_count}")
+
+            if not userQueryId:
+                print("[ERROR] Tidak dapat userQueryId!")
+                print(data)
+                return
+            state.update(userQueryId=userQueryId, total_count=total_count, last_page=0, complete=False)
+
+        write_header = not os.path.exists(out_csv) or os.path.getsize(out_csv) == 0
+        saved = 0
+        with open(out_csv, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(CSV_HEADER)
+            pages = fetcher.iter_pages(userQueryId, total_count, max_pages=max_pages,
+                                       start_page=state["last_page"] + 1)
+            if raw_dir:
+                pages = iter_dump_raw(pages, raw_dump_path(raw_dir, userQueryId), userQueryId)
+            pages = iter_new_jobs(pages, state["seen_ids"], state["new_ids"])
+            if index is not None:
+                pages = iter_unique_jobs(pages, index, skipped)
+            for page, jobs in pages:
+                # Ekstrak dulu seluruh halaman agar baris tidak tertulis setengah jika terputus
+                writer.writerows([job_to_row(job) for job in jobs])
+                f.flush()
+                os.fsync(f.fileno())
+                saved += len(jobs)
+                if index is not None:
+                    # Indeks hanya berisi job yang sudah ditulis; disimpan inkremental (append log)
+                    index.commit()
+                    index.flush(index_path(out_csv))
+                # Checkpoint ditulis terakhir, jadi hanya menunjuk data yang sudah tersimpan
+                state.update(last_page=page, csv_bytes=f.tell())
+                save_checkpoint(out_csv, state)
+                print(f"[INFO] Page {page}: {len(jobs)} new jobs ({skipped.get(page, 0)} near-duplicates skipped), "
+                      f"total saved this run: {saved}")
+
+        state["complete"] = True
+        save_checkpoint(out_csv, state)
+    finally:
+        fetcher.close()
+        if cache is not None and cache.read:
+            cache.evict()
+            print(f"[INFO] Cache HTTP: {cache.hits} halaman dari cache, {cache.misses} diunduh")
+
+    print(f"[INFO] Saved {saved} new cleaned jobs with category to {out_csv} "
+          f"({sum(skipped.values())} near-duplicates skipped)")
+    if saved and convert_csv(out_csv):
+        print(f"[INFO] Dataset bertipe disimpan ke {parquet_path(out_csv)}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl lowongan Jobstreet ke dataset CSV")
+    parser.add_argument("-o", "--output", default="jobstreet_jobs_cleaned_with_category.csv")
+    parser.add_argument("--max-pages", type=int, default=100)
+    parser.add_argument("--pagesize", type=int, default=32)
+    parser.add_argument("--base-url", default=BASE_URL, help="Endpoint pencarian (mis. server replay lokal)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=8.0, help="Maksimum request per detik")
+    parser.add_argument("--cache", action="store_true", help=f"Aktifkan cache respons HTTP di {CACHE_DIR}/")
+    parser.add_argument("--cache-dir", default=None, help="Aktifkan cache respons HTTP di folder ini")
+    parser.add_argument("--cache-ttl", type=float, default=CACHE_TTL, help="Umur cache respons (detik)")
+    parser.add_argument("--record", default=None, metavar="DIR", help="Rekam semua respons ke DIR untuk replay")
+    parser.add_argument("--no-resume", action="store_true", help="Mulai crawl baru, abaikan checkpoint")
+    parser.add_argument("--no-dedupe", action="store_true", help="Jangan buang lowongan hampir duplikat")
+    args = parser.parse_args(argv)
+    fetch_jobstreet_jobs(max_pages=args.max_pages, pagesize=args.pagesize, out_csv=args.output,
+                         base_url=args.base_url, concurrency=args.concurrency, rate=args.rate,
+                         resume=not args.no_resume, dedupe=not args.no_dedupe,
+                         cache_dir=args.cache_dir or (CACHE_DIR if args.cache else None), cache_ttl=args.cache_ttl,
+                         record_dir=args.record)
+
 
 if __name__ == "__main__":
-    fetch_jobstreet_jobs(max_pages=100, pagesize=32, out_csv="jobstreet_jobs_cleaned_with_category.csv")
\ No newline at end of file
+    main()
\ No newline at end of file
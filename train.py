@@ -0,0 +1,271 @@
+"""
+Pipeline training yang bisa dijalankan ulang, diekstrak dari main.ipynb.
+
+Langkahnya sama dengan notebook (isi gaji kosong dengan median per
+kategori, Gaji_Rata sebagai target, split 80/20), dengan perbedaan:
+- fitur dibangun oleh FeatureEncoder yang juga dipakai saat serving,
+- pencarian hyperparameter memakai HalvingRandomSearchCV (successive
+  halving) alih-alih GridSearchCV penuh,
+- fold CV dibuat sekali dan dipakai bersama oleh semua model,
+- XGBoost final dilatih dengan early stopping pada validation split,
+- paralelisme dibatasi eksplisit lewat --n-jobs,
+- snapshot training (lowongan yang sudah dipakai, distribusi target, RMSE,
+  lowongan di test split) disimpan untuk refresh inkremental di refresh.py.
+
+Contoh:
+    python train.py --n-jobs 4
+"""
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import HalvingRandomSearchCV, KFold, train_test_split
+from xgboost import XGBRegressor
+
+from artifacts import file_hash
+from compiled_model import COMPILED_PATH, compile_model
+from dataset import TRAIN_COLUMNS, load_dataset
+from features import CATEGORY_PREFIX, ENCODER_PATH, FeatureEncoder
+
+BASE_COLUMNS = ['Tahun Pengalaman', 'Pendidikan_Encoded', 'Jumlah_Skill']
+SNAPSHOT_PATH = 'training_snapshot.pkl'
+SNAPSHOT_VERSION = 1
+TARGET_BINS = 10
+
+SEARCH_SPACES = {
+    'XGBoost': {
+        'n_estimators': [100, 150, 200, 300],
+        'learning_rate': [0.03, 0.05, 0.1],
+        'max_depth': [3, 4, 5, 6],
+        'subsample': [0.8, 1.0],
+        'colsample_bytree': [0.8, 1.0],
+    },
+    'RandomForest': {
+        'n_estimators': [100, 150, 200],
+        'max_depth': [None, 5, 10, 20],
+        'min_samples_split': [2, 5, 10],
+        'min_samples_leaf': [1, 2, 4],
+    },
+}
+
+
+def prepare_data(df):
+    """Bersihkan dataset dan kembalikan (df, target) seperti di notebook."""
+    df = df.copy()
+    df[['Gaji Min', 'Gaji Max']] = df[['Gaji Min', 'Gaji Max']].astype('float64')
+    # Tandai gaji asli (bukan hasil isi median) untuk deteksi drift
+    df['Gaji_Terisi'] = df['Gaji Min'].notna() & df['Gaji Max'].notna()
+    for col in ['Gaji Min', 'Gaji Max']:
+        df[col] = df.groupby('Kategori_Lowongan', observed=True)[col].transform(lambda x: x.fillna(x.median()))
+    df = df.dropna(subset=['Gaji Min', 'Gaji Max']).reset_index(drop=True)
+    y = ((df['Gaji Min'] + df['Gaji Max']) / 2).to_numpy(dtype=np.float64)
+    return df, y
+
+
+def build_encoder(df, base_columns=None):
+    """
+    Encoder dengan kolom dasar + satu kolom per kategori (urut alfabet, seperti
+    OneHotEncoder). Jika base_columns diberikan, urutan kolom lama dipertahankan
+    dan kategori baru ditambahkan di akhir.
+    """
+    categories = sorted(df['Kategori_Lowongan'].astype(str).unique())
+    if base_columns is None:
+        return FeatureEncoder(BASE_COLUMNS + [CATEGORY_PREFIX + c for c in categories])
+    known = set(base_columns)
+    return FeatureEncoder(list(base_columns) + [CATEGORY_PREFIX + c for c in categories
+                                                if CATEGORY_PREFIX + c not in known])
+
+
+def link_keys(links):
+    """Hash uint64 per link lowongan, dipakai untuk menandai lowongan yang sudah dilatih."""
+    return pd.util.hash_pandas_object(links.astype(str), index=False).to_numpy()
+
+
+def target_bins(y, edges):
+    """Proporsi target per bin kuantil (nilai di luar rentang masuk bin ujung)."""
+    counts = np.bincount(np.searchsorted(edges[1:-1], y, side='right'), minlength=len(edges) - 1)
+    return counts / max(len(y), 1)
+
+
+def make_snapshot(df, y, model_name, params, rmse, test_keys):
+    """Ringkasan data training untuk refresh inkremental dan deteksi drift."""
+    observed = y[df['Gaji_Terisi'].to_numpy()]
+    edges = np.unique(np.quantile(observed, np.linspace(0, 1, TARGET_BINS + 1)))
+    return {
+        'version': SNAPSHOT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'model_name': model_name,
+        'params': params,
+        'seen': np.unique(link_keys(df['Link'])),
+        'n_rows': len(df),
+        'target_edges': edges,
+        'target_hist': target_bins(observed, edges),
+        'rmse': float(rmse),
+        # Test split tetap, dipakai refresh.py untuk mengevaluasi ulang model
+        'test_keys': np.unique(test_keys),
+        'refreshes': [],
+    }
+
+
+def load_snapshot(output_dir='.'):
+    """Muat snapshot training, atau None jika belum ada / versinya berbeda."""
+    path = os.path.join(output_dir, SNAPSHOT_PATH)
+    if not os.path.exists(path):
+        return None
+    snapshot = joblib.load(path)
+    return snapshot if snapshot.get('version') == SNAPSHOT_VERSION else None
+
+
+def save_artifacts(model, encoder, metrics, snapshot, output_dir='.'):
+    """Simpan model (pickle + terkompilasi), metrik, kolom, encoder, dan snapshot."""
+    os.makedirs(output_dir, exist_ok=True)
+    model_path = os.path.join(output_dir, 'best_salary_predictor.pkl')
+    joblib.dump(model, model_path)
+    compile_model(model, source_hash=file_hash(model_path)).save(os.path.join(output_dir, COMPILED_PATH))
+    joblib.dump(metrics, os.path.join(output_dir, 'model_metrics.pkl'))
+    joblib.dump(encoder.columns, os.path.join(output_dir, 'model_columns.pkl'))
+    encoder.save(os.path.join(output_dir, ENCODER_PATH))
+    joblib.dump(snapshot, os.path.join(output_dir, SNAPSHOT_PATH))
+
+
+def profile_frame(df):
+    """
+    Ubah kolom dataset ke format profil yang dibaca FeatureEncoder.transform_frame.
+    Skill kosong (NaN) dihitung 1 skill seperti di notebook
+    (len(str(x).split(','))), agar fitur Jumlah_Skill sama dengan baseline.
+    """
+    return pd.DataFrame({
+        'role': df['Kategori_Lowongan'].astype(str),
+        'pendidikan': df['Pendidikan'],
+        # Lowongan tanpa syarat pengalaman dianggap 0 tahun
+        'pengalaman': df['Tahun Pengalaman'].astype('float64').fillna(0),
+        'skills': df['Skill'].fillna('N/A'),
+    })
+
+
+def make_models(seed):
+    # n_jobs=1 per model: paralelisme diatur di level search agar tidak oversubscribe
+    return {
+        'XGBoost': XGBRegressor(random_state=seed, tree_method='hist', n_jobs=1),
+        'RandomForest': RandomForestRegressor(random_state=seed, n_jobs=1),
+    }
+
+
+def search_model(name, model, X, y, folds, n_jobs, seed, factor=3, n_candidates=24):
+    search = HalvingRandomSearchCV(
+        estimator=model,
+        param_distributions=SEARCH_SPACES[name],
+        n_candidates=n_candidates,
+        factor=factor,
+        cv=folds,
+        scoring='neg_mean_squared_error',
+        n_jobs=n_jobs,
+        random_state=seed,
+        refit=False,
+    )
+    search.fit(X, y)
+    return search.best_params_
+
+
+def fit_final(name, params, X, y, n_jobs, seed, early_stopping_rounds=30):
+    """Latih ulang model terbaik di seluruh data train."""
+    if name == 'XGBoost':
+        X_fit, X_val, y_fit, y_val = train_test_split(X, y, test_size=0.1, random_state=seed)
+        model = XGBRegressor(
+            **{**params, 'n_estimators': 2000},
+            random_state=seed, tree_method='hist', n_jobs=n_jobs,
+            early_stopping_rounds=early_stopping_rounds,
+        )
+        model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+        return model
+    model = RandomForestRegressor(**params, random_state=seed, n_jobs=n_jobs)
+    model.fit(X, y)
+    return model
+
+
+def train(data_path=None, output_dir='.', n_jobs=None, cv=5, seed=42, factor=3, n_candidates=24,
+          base_columns=None):
+    n_jobs = n_jobs or min(4, os.cpu_count() or 1)
+    df, y = prepare_data(load_dataset(TRAIN_COLUMNS + ['Link'], data_path))
+    encoder = build_encoder(df, base_columns)
+    X = encoder.transform_frame(profile_frame(df))
+
+    X_train, X_test, y_train, y_test, _, keys_test = train_test_split(
+        X, y, link_keys(df['Link']), test_size=0.2, random_state=seed)
+    train_mask = np.isfinite(y_train)
+    test_mask = np.isfinite(y_test)
+    X_train, y_train = X_train[train_mask], y_train[train_mask]
+    X_test, y_test, keys_test = X_test[test_mask], y_test[test_mask], keys_test[test_mask]
+    print(f"[INFO] Train shape: {X_train.shape}, Test shape: {X_test.shape}")
+
+    folds = list(KFold(n_splits=cv, shuffle=True, random_state=seed).split(X_train))
+
+    results = []
+    best_models = {}
+    for name, model in make_models(seed).items():
+        print(f"\n[INFO] Training {name}...")
+        start = time.perf_counter()
+        params = search_model(name, model, X_train, y_train, folds, n_jobs, seed, factor, n_candidates)
+        best_model = fit_final(name, params, X_train, y_train, n_jobs, seed)
+        y_pred_test = best_model.predict(X_test)
+        best_models[name] = best_model
+        results.append({
+            'Model': name,
+            'Best Params': params,
+            'RMSE Test': np.sqrt(mean_squared_error(y_test, y_pred_test)),
+            'R2 Test': r2_score(y_test, y_pred_test),
+            'Seconds': time.perf_counter() - start,
+        })
+        print(f"[INFO] {name}: params={params}")
+        print(f"[INFO] Test RMSE: {results[-1]['RMSE Test']:.2f}, R2: {results[-1]['R2 Test']:.4f} "
+              f"({results[-1]['Seconds']:.1f} detik)")
+
+    results_df = pd.DataFrame(results)
+    best_model_name = results_df.loc[results_df['R2 Test'].idxmax(), 'Model']
+    best_model = best_models[best_model_name]
+    y_pred_final = best_model.predict(X_test)
+
+    metrics = {
+        'best_model': best_model_name,
+        'r2': r2_score(y_test, y_pred_final),
+        'rmse': np.sqrt(mean_squared_error(y_test, y_pred_final)),
+        'mae': mean_absolute_error(y_test, y_pred_final),
+        'test_size': len(y_test),
+        'error_dist': (y_pred_final - y_test).tolist(),
+        'feature_importances': pd.DataFrame({
+            'Feature': encoder.columns,
+            'Importance': best_model.feature_importances_,
+        }).sort_values('Importance', ascending=False),
+    }
+
+    best_params = results_df.loc[results_df['Model'] == best_model_name, 'Best Params'].iloc[0]
+    snapshot = make_snapshot(df, y, best_model_name, best_params, metrics['rmse'], keys_test)
+    save_artifacts(best_model, encoder, metrics, snapshot, output_dir)
+
+    print(f"\n[INFO] Model terbaik: {best_model_name} (R2 {metrics['r2']:.4f}, RMSE {metrics['rmse']:.2f})")
+    print(f"[INFO] Model dan metrik berhasil disimpan ke {os.path.abspath(output_dir)}")
+    return best_model, metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Training model prediksi gaji")
+    parser.add_argument('--data', default=None, help="Path dataset (default: Parquet/CSV bawaan)")
+    parser.add_argument('--output-dir', default='.', help="Folder untuk menyimpan artefak model")
+    parser.add_argument('--n-jobs', type=int, default=None, help="Batas proses paralel (default: min(4, CPU))")
+    parser.add_argument('--cv', type=int, default=5, help="Jumlah fold cross-validation")
+    parser.add_argument('--factor', type=int, default=3, help="Faktor eliminasi successive halving")
+    parser.add_argument('--n-candidates', type=int, default=24, help="Jumlah kandidat awal per model")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+    train(args.data, args.output_dir, n_jobs=args.n_jobs, cv=args.cv, seed=args.seed,
+          factor=args.factor, n_candidates=args.n_candidates)
+
+
+if __name__ == "__main__":
+    main()